@@ -4,9 +4,20 @@ Add specific NBA games to markets.json
 """
 
 import json
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from kalshi_client import KalshiClient
 from polymarket_client import PolymarketClient
 
+# Use orjson to write markets.json when it's installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Target games to find
 TARGET_GAMES = [
     ("Denver", "Philadelphia"),  # Nuggets vs 76ers
@@ -14,6 +25,26 @@ TARGET_GAMES = [
     ("Utah", "Portland")  # Jazz vs Trail Blazers
 ]
 
+# Team name mappings for matching Polymarket titles/slugs
+TEAM_KEYWORDS = {
+    'Denver': ['denver', 'nuggets', 'den'],
+    'Philadelphia': ['philadelphia', 'sixers', '76ers', 'phi'],
+    'Golden State': ['golden state', 'warriors', 'gsw'],
+    'Los Angeles C': ['clippers', 'lac', 'la clippers'],
+    'Utah': ['utah', 'jazz'],
+    'Portland': ['portland', 'trail blazers', 'blazers', 'por']
+}
+
+def team_pattern(team):
+    """One alternation of a team's keywords, so a search text is scanned once per team"""
+    return re.compile('|'.join(map(re.escape, TEAM_KEYWORDS.get(team, [team.lower()]))))
+
+# Compiled once at import rather than on every find_target_games call
+TEAM_PATTERNS = {team: team_pattern(team) for team in TEAM_KEYWORDS}
+
+# Kalshi market ticker: SERIES-EVENT[-TEAM] (e.g., KXNBAGAME-26JAN06DENGSW-DEN)
+_TICKER_RE = re.compile(r'^[^-]*-([^-]*)(?:-([^-]*))?')
+
 def discover_kalshi_nba(client):
     """Discover NBA markets on Kalshi"""
     print("\n🏀 Searching Kalshi for NBA games...")
@@ -23,34 +54,44 @@ def discover_kalshi_nba(client):
         'status': 'open'
     }
     
-    response = client._make_request('GET', '/markets', params=params)
-    markets = response.get('markets', [])
-    print(f"   Found {len(markets)} active NBA markets")
-    
-    # Group by game
-    games = {}
-    for market in markets:
-        ticker = market['ticker']
-        title = market['title']
+    # Follow the cursor so a series with more than one page of open markets isn't truncated,
+    # grouping each page by game as it arrives
+    markets_by_event = defaultdict(list)
+    market_count = 0
+    seen_cursors = set()
+    while True:
+        response = client._make_request('GET', '/markets', params=params)
+        if not response:
+            break
         
-        # Parse event_ticker from full ticker (e.g., KXNBAGAME-26JAN06DENGSW-DEN)
-        parts = ticker.split('-')
-        if len(parts) >= 2:
-            event_ticker = parts[1]  # e.g., 26JAN06DENGSW
-            
-            if event_ticker not in games:
-                games[event_ticker] = {
-                    'event_ticker': event_ticker,
-                    'markets': []
-                }
+        markets = response.get('markets', [])
+        market_count += len(markets)
+        for market in markets:
+            ticker = market['ticker']
             
-            games[event_ticker]['markets'].append({
-                'ticker': ticker,
-                'title': title,
-                'team': parts[2] if len(parts) > 2 else None
-            })
+            # Parse event_ticker (e.g., 26JAN06DENGSW) and team (e.g., DEN) from full ticker
+            match = _TICKER_RE.match(ticker)
+            if match:
+                event_ticker, team = match.groups()
+                # (ticker, title, team) - team is None for tickers without a team suffix
+                markets_by_event[event_ticker].append((ticker, market['title'], team))
+        
+        cursor = response.get('cursor')
+        if not cursor or not markets:
+            break
+        # A cursor we've already followed would just replay pages forever
+        if cursor in seen_cursors:
+            print(f"   ⚠️  Kalshi repeated a pagination cursor - stopping after {market_count} markets")
+            break
+        seen_cursors.add(cursor)
+        params['cursor'] = cursor
+    
+    print(f"   Found {market_count} active NBA markets")
     
-    return games
+    return {
+        event_ticker: {'event_ticker': event_ticker, 'markets': event_markets}
+        for event_ticker, event_markets in markets_by_event.items()
+    }
 
 def discover_polymarket_nba(client):
     """Discover NBA markets on Polymarket"""
@@ -87,47 +128,51 @@ def find_target_games(kalshi_games, poly_events):
     """Match target games across both platforms"""
     print("\n🔍 Matching target games...")
     
+    # Nothing can match if either discovery came back empty (e.g. a failed fetch)
+    if not kalshi_games or not poly_events:
+        print("   ⚠️  Skipping match — one source empty")
+        return []
+    
     matched = []
     
-    # Team name mappings for matching
-    TEAM_KEYWORDS = {
-        'Denver': ['denver', 'nuggets', 'den'],
-        'Philadelphia': ['philadelphia', 'sixers', '76ers', 'phi'],
-        'Golden State': ['golden state', 'warriors', 'gsw'],
-        'Los Angeles C': ['clippers', 'lac', 'la clippers'],
-        'Utah': ['utah', 'jazz'],
-        'Portland': ['portland', 'trail blazers', 'blazers', 'por']
-    }
+    # Normalize each event's team codes / search text once, not once per target game
+    kalshi_index = [
+        (event_ticker, game_data, [team.upper() for _, _, team in game_data['markets'] if team])
+        for event_ticker, game_data in kalshi_games.items()
+    ]
+    poly_index = [
+        (event, f"{event.get('title', '').lower()} {event.get('slug', '').lower()}")
+        for event in poly_events
+    ]
+    
+    # Inverted index: target team -> positions of Kalshi events with a team code containing it
+    target_teams = {team for game in TARGET_GAMES for team in game}
+    kalshi_events_by_team = defaultdict(set)
+    for position, (_, _, teams_upper) in enumerate(kalshi_index):
+        for team in target_teams:
+            team_upper = team.upper()
+            if any(team_upper in t for t in teams_upper):
+                kalshi_events_by_team[team].add(position)
     
     for target_a, target_b in TARGET_GAMES:
         print(f"\n   Looking for: {target_a} vs {target_b}")
         
-        # Find in Kalshi
+        # Find in Kalshi - first event (in discovery order) that has both target teams
         kalshi_match = None
-        for event_ticker, game_data in kalshi_games.items():
-            markets = game_data['markets']
-            teams_in_event = [m['team'] for m in markets if m['team']]
-            
-            # Check if both target teams are in this event
-            teams_upper = [t.upper() if t else '' for t in teams_in_event]
-            if any(target_a.upper() in t for t in teams_upper) and any(target_b.upper() in t for t in teams_upper):
-                kalshi_match = game_data
-                print(f"      ✓ Found on Kalshi: {event_ticker}")
-                break
+        candidates = kalshi_events_by_team[target_a] & kalshi_events_by_team[target_b]
+        if candidates:
+            event_ticker, kalshi_match, _ = kalshi_index[min(candidates)]
+            print(f"      ✓ Found on Kalshi: {event_ticker}")
         
         # Find in Polymarket
         poly_match = None
-        target_a_keywords = TEAM_KEYWORDS.get(target_a, [target_a.lower()])
-        target_b_keywords = TEAM_KEYWORDS.get(target_b, [target_b.lower()])
+        target_a_pattern = TEAM_PATTERNS.get(target_a) or team_pattern(target_a)
+        target_b_pattern = TEAM_PATTERNS.get(target_b) or team_pattern(target_b)
         
-        for event in poly_events:
-            title = event.get('title', '').lower()
-            slug = event.get('slug', '').lower()
-            search_text = f"{title} {slug}"
-            
+        for event, search_text in poly_index:
             # Check if both teams are mentioned
-            has_team_a = any(keyword in search_text for keyword in target_a_keywords)
-            has_team_b = any(keyword in search_text for keyword in target_b_keywords)
+            has_team_a = target_a_pattern.search(search_text) is not None
+            has_team_b = target_b_pattern.search(search_text) is not None
             
             if has_team_a and has_team_b:
                 poly_match = event
@@ -140,21 +185,21 @@ def find_target_games(kalshi_games, poly_events):
             team_b = None
             
             # Extract teams from Kalshi market titles
-            for m in kalshi_match['markets']:
-                if m['team']:
+            for _, _, team in kalshi_match['markets']:
+                if team:
                     if not team_a:
-                        team_a = m['team']
-                    elif m['team'] != team_a:
-                        team_b = m['team']
+                        team_a = team
+                    elif team != team_a:
+                        team_b = team
             
             # Find main and opponent tickers
             main_ticker = None
             opponent_ticker = None
-            for m in kalshi_match['markets']:
-                if m['team'] == team_a:
-                    main_ticker = m['ticker']
-                elif m['team'] == team_b:
-                    opponent_ticker = m['ticker']
+            for ticker, _, team in kalshi_match['markets']:
+                if team == team_a:
+                    main_ticker = ticker
+                elif team == team_b:
+                    opponent_ticker = ticker
             
             matched.append({
                 'kalshi': kalshi_match,
@@ -185,7 +230,7 @@ def generate_market_entries(matched_games):
         event_id = f"kxnbagame_{kalshi_data['event_ticker'].lower()}"
         
         # Get description from first Kalshi market
-        description = kalshi_data['markets'][0]['title'] if kalshi_data['markets'] else "NBA Game"
+        description = kalshi_data['markets'][0][1] if kalshi_data['markets'] else "NBA Game"
         
         # Get event date from Polymarket
         event_date = poly_event.get('endDate', '2026-01-06T00:00:00Z')
@@ -239,9 +284,12 @@ def main():
     )
     polymarket = PolymarketClient()
     
-    # Discover markets
-    kalshi_games = discover_kalshi_nba(kalshi)
-    poly_events = discover_polymarket_nba(polymarket)
+    # Discover markets (independent hosts, so run both lookups at once)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        kalshi_future = executor.submit(discover_kalshi_nba, kalshi)
+        poly_future = executor.submit(discover_polymarket_nba, polymarket)
+        kalshi_games = kalshi_future.result()
+        poly_events = poly_future.result()
     
     # Find target games
     matched = find_target_games(kalshi_games, poly_events)
@@ -257,22 +305,28 @@ def main():
     with open('config/markets.json', 'r') as f:
         markets_config = json.load(f)
     
-    # Add new entries
+    # Add new entries (the id set is kept in step with the list as entries are appended)
     existing_ids = {m['event_id'] for m in markets_config['markets']}
     added_count = 0
     
     for entry in new_entries:
         if entry['event_id'] not in existing_ids:
             markets_config['markets'].append(entry)
+            existing_ids.add(entry['event_id'])
             added_count += 1
             print(f"\n✅ Added: {entry['description']}")
         else:
             print(f"\n⚠️  Already exists: {entry['description']}")
     
-    # Save
+    # Save (write a temp file, then rename over markets.json so a crash can't truncate it)
     if added_count > 0:
-        with open('config/markets.json', 'w') as f:
-            json.dump(markets_config, f, indent=2)
+        tmp_path = Path('config/markets.json.tmp')
+        if orjson is not None:
+            tmp_path.write_bytes(orjson.dumps(markets_config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(tmp_path, 'w') as f:
+                json.dump(markets_config, f, indent=2)
+        os.replace(tmp_path, 'config/markets.json')
         
         print(f"\n" + "=" * 80)
         print(f"✅ SUCCESS! Added {added_count} NBA game(s) to markets.json")
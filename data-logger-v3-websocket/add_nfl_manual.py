@@ -1,5 +1,38 @@
 import json
+import os
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Use orjson to parse embedded JSON fields and write markets.json when it's installed
+try:
+    import orjson
+    loads_json = orjson.loads
+except ImportError:
+    orjson = None
+    loads_json = json.loads
+
+# One pooled session so every Gamma request (batch and fallback) reuses keep-alive connections.
+# Once retries run out the last 429/5xx response is returned (not raised) so its status gets reported.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET'],
+        raise_on_status=False
+    )
+))
+
+# Gamma event metadata rarely changes within a day - reruns read it from disk for an hour
+CACHE_DIR = Path('.cache/gamma_events')
+CACHE_TTL = 3600  # seconds
 
 # Manual NFL games from Polymarket URLs
 nfl_games = [
@@ -23,26 +56,48 @@ nfl_games = [
     }
 ]
 
-markets = []
+def load_cached_event(slug):
+    """Return the cached Gamma event for a slug, or None if missing/expired"""
+    path = CACHE_DIR / f"{slug}.json"
+    try:
+        if time.time() - path.stat().st_mtime < CACHE_TTL:
+            return json.loads(path.read_text())
+    except (OSError, ValueError):
+        pass
+    return None
 
-for game in nfl_games:
-    print(f"\nProcessing: {game['title']}")
-    print(f"  Slug: {game['poly_slug']}")
-    
-    # Query Polymarket Gamma API for this event
-    url = f"https://gamma-api.polymarket.com/events?slug={game['poly_slug']}"
-    response = requests.get(url, timeout=10)
+def save_cached_event(slug, event):
+    """Store a fetched Gamma event for later runs"""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (CACHE_DIR / f"{slug}.json").write_text(json.dumps(event))
+    except OSError as e:
+        print(f"  ⚠️  Could not cache event {slug}: {e}")
+
+def fetch_event(slug):
+    """Fetch a single Gamma event by slug (None if it can't be fetched)"""
+    try:
+        response = SESSION.get("https://gamma-api.polymarket.com/events", params={'slug': slug}, timeout=10)
+    except requests.RequestException as e:
+        print(f"  ✗ Error fetching Polymarket data for {slug}: {e}")
+        return None
     
     if response.status_code != 200:
-        print(f"  ✗ Failed to fetch Polymarket data: {response.status_code}")
-        continue
+        print(f"  ✗ Failed to fetch Polymarket data for {slug}: {response.status_code}")
+        return None
     
     events = response.json()
-    if not events or len(events) == 0:
+    return events[0] if events else None
+
+def build_market(game, event):
+    """Build a game's markets.json entry from its Gamma event (None if it can't be matched)"""
+    print(f"\nProcessing: {game['title']}")
+    print(f"  Slug: {game['poly_slug']}")
+    
+    if not event:
         print(f"  ✗ No events found for slug: {game['poly_slug']}")
-        continue
+        return None
     
-    event = events[0]
     markets_list = event.get('markets', [])
     
     # Find moneyline market
@@ -50,7 +105,7 @@ for game in nfl_games:
     for market in markets_list:
         outcomes = market.get('outcomes', [])
         if isinstance(outcomes, str):
-            outcomes = json.loads(outcomes)
+            outcomes = loads_json(outcomes)
         
         if len(outcomes) == 2:
             outcome_str = ' '.join(outcomes).lower()
@@ -60,30 +115,33 @@ for game in nfl_games:
     
     if not moneyline:
         print(f"  ✗ No moneyline market found")
-        continue
+        return None
     
     outcomes = moneyline.get('outcomes', [])
     tokens = moneyline.get('clobTokenIds', [])
     condition_id = moneyline.get('conditionId', '')
     
     if isinstance(outcomes, str):
-        outcomes = json.loads(outcomes)
+        outcomes = loads_json(outcomes)
     if isinstance(tokens, str):
-        tokens = json.loads(tokens)
+        tokens = loads_json(tokens)
     
     print(f"  ✓ Outcomes: {outcomes}")
     print(f"  ✓ Token IDs: {tokens}")
     
-    # Build market config
+    # Build market config (lowercase each outcome once, not once per team)
+    outcomes_lc = [outcome.lower() for outcome in outcomes]
     poly_token_ids = {}
     for code, team_data in game['teams'].items():
+        full_lc = team_data['full'].lower()
+        code_lc = code.lower()
         # Find matching outcome
-        for i, outcome in enumerate(outcomes):
-            if team_data['full'].lower() in outcome.lower() or code.lower() in outcome.lower():
+        for i, outcome_lc in enumerate(outcomes_lc):
+            if full_lc in outcome_lc or code_lc in outcome_lc:
                 poly_token_ids[code] = tokens[i]
                 break
     
-    markets.append({
+    market_entry = {
         "event_id": game['kalshi_event'],
         "league": "NFL",
         "kalshi_ticker": game['kalshi_event'],
@@ -91,17 +149,69 @@ for game in nfl_games:
         "poly_condition_id": condition_id,
         "poly_token_ids": poly_token_ids,
         "display_name": game['title']
-    })
+    }
     
     print(f"  ✓ Added to markets")
+    return market_entry
+
+markets = []
+
+# Start from cached events; only slugs without a fresh cache entry hit the API
+events_by_slug = {}
+for game in nfl_games:
+    event = load_cached_event(game['poly_slug'])
+    if event:
+        events_by_slug[game['poly_slug']] = event
+
+uncached_slugs = [game['poly_slug'] for game in nfl_games if game['poly_slug'] not in events_by_slug]
+
+if uncached_slugs:
+    # Query Polymarket Gamma API for every event in one request (repeated slug params)
+    params = [('slug', slug) for slug in uncached_slugs] + [('limit', len(uncached_slugs))]
+    fetched = {}
+    try:
+        response = SESSION.get("https://gamma-api.polymarket.com/events", params=params, timeout=10)
+    except requests.RequestException as e:
+        print(f"✗ Error fetching Polymarket data: {e}")
+    else:
+        if response.status_code == 200:
+            fetched = {event.get('slug'): event for event in response.json()}
+        else:
+            print(f"✗ Failed to fetch Polymarket data: {response.status_code}")
+    
+    # Fall back to per-slug requests (in parallel) for anything the batch didn't return
+    missing_slugs = [slug for slug in uncached_slugs if slug not in fetched]
+    if missing_slugs:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for slug, event in zip(missing_slugs, executor.map(fetch_event, missing_slugs)):
+                if event:
+                    fetched[slug] = event
+    
+    for slug in uncached_slugs:
+        if slug in fetched:
+            events_by_slug[slug] = fetched[slug]
+            save_cached_event(slug, fetched[slug])
+
+SESSION.close()
+
+# Fetches are already batched/parallel above; per-game processing is local work
+for game in nfl_games:
+    market_entry = build_market(game, events_by_slug.get(game['poly_slug']))
+    if market_entry:
+        markets.append(market_entry)
 
-# Write to markets.json
+# Write to markets.json (via a temp file + rename so a crash can't truncate it)
 config = {
     "markets": markets,
     "last_updated": "2026-01-10"
 }
 
-with open('config/markets.json', 'w') as f:
-    json.dump(config, f, indent=2)
+tmp_path = Path('config/markets.json.tmp')
+if orjson is not None:
+    tmp_path.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+else:
+    with open(tmp_path, 'w') as f:
+        json.dump(config, f, indent=2)
+os.replace(tmp_path, 'config/markets.json')
 
 print(f"\n✓ Wrote {len(markets)} NFL games to config/markets.json")
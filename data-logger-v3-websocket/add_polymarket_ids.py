@@ -12,24 +12,115 @@ Usage:
 """
 
 import argparse
+import io
 import json
+import os
+import sys
 from pathlib import Path
 
+# Optional: stream-parse large market files without holding the raw text in memory
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional: orjson serializes markets.json in C, far faster than json.dump
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+STREAM_PARSE_MIN_BYTES = 8 * 1024 * 1024  # Below this, json.load is faster
+
 
 def load_markets(input_file):
-    """Load markets from JSON file"""
+    """Load markets from JSON file
+    
+    Large files are parsed incrementally with ijson when it's installed, so peak
+    memory is the parsed markets alone rather than raw text + parsed tree.
+    """
+    if ijson is not None and os.path.getsize(input_file) >= STREAM_PARSE_MIN_BYTES:
+        with open(input_file, 'rb') as f:
+            return dict(ijson.kvitems(f, '', use_float=True))
+    
     with open(input_file, 'r') as f:
         data = json.load(f)
     return data
 
 
 def save_markets(markets_data, output_file):
-    """Save markets to JSON file"""
-    with open(output_file, 'w') as f:
-        json.dump(markets_data, f, indent=2)
+    """Save markets to JSON file
+    
+    Writes to a temp file next to the target and renames it over the original,
+    so an interrupted run never leaves a half-written markets file behind.
+    """
+    tmp_file = Path(output_file).with_suffix('.json.tmp')
+    if orjson is not None:
+        tmp_file.write_bytes(orjson.dumps(markets_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_file, 'w') as f:
+            json.dump(markets_data, f, indent=2)
+    os.replace(tmp_file, output_file)
     print(f"✅ Saved to {output_file}")
 
 
+def _handle_quit(market):
+    """Stop prompting; remaining markets keep their current config"""
+    print("\nExiting...")
+    return True
+
+
+def _handle_disable(market):
+    """Disable Polymarket for a market"""
+    market['polymarket']['enabled'] = False
+    print("    ✓ Disabled Polymarket for this market")
+
+
+def _handle_add(market):
+    """Prompt for a market's Polymarket IDs and whether to enable it"""
+    print(f"\n    Enter Polymarket condition IDs:")
+    print(f"    (Find these on polymarket.com by searching for the game)")
+    print(f"    (Leave blank to skip)")
+    
+    team_a = input(f"      {market['teams']['team_a']} ID: ").strip()
+    team_b = input(f"      {market['teams']['team_b']} ID: ").strip()
+    
+    if team_a or team_b:
+        if 'polymarket' not in market:
+            market['polymarket'] = {}
+        if 'markets' not in market['polymarket']:
+            market['polymarket']['markets'] = {}
+        
+        if team_a:
+            market['polymarket']['markets']['team_a'] = team_a
+        if team_b:
+            market['polymarket']['markets']['team_b'] = team_b
+        
+        # Ask if they want to enable
+        enable = input(f"      Enable Polymarket for this market? [y/n]: ").strip().lower()
+        market['polymarket']['enabled'] = enable == 'y' or enable == 'yes'
+        
+        print("    ✓ Added Polymarket IDs")
+    else:
+        print("    ⊘ Skipped (no IDs entered)")
+
+
+def _handle_skip(market):
+    """Leave a market unchanged"""
+    print("    ⊘ Skipped")
+
+
+# Interactive menu choices -> handler
+_DISPATCH = {
+    'q': _handle_quit,
+    'quit': _handle_quit,
+    '3': _handle_disable,
+    'disable': _handle_disable,
+    '1': _handle_add,
+    '2': _handle_skip
+}
+
+
 def add_polymarket_ids_interactive(markets_data):
     """Interactively add Polymarket IDs to markets"""
     print("\n" + "=" * 80)
@@ -45,63 +136,36 @@ def add_polymarket_ids_interactive(markets_data):
     markets = markets_data.get('markets', [])
     
     for i, market in enumerate(markets, 1):
-        print(f"\n[{i}/{len(markets)}] {market['description']}")
-        print(f"    Event ID: {market['event_id']}")
-        print(f"    Teams: {market['teams']['team_a']} vs {market['teams']['team_b']}")
+        # Build the whole market block and write it once, instead of a print per line
+        buf = io.StringIO()
+        buf.write(f"\n[{i}/{len(markets)}] {market['description']}\n")
+        buf.write(f"    Event ID: {market['event_id']}\n")
+        buf.write(f"    Teams: {market['teams']['team_a']} vs {market['teams']['team_b']}\n")
         
         # Show current Polymarket config
         poly_config = market.get('polymarket', {})
         current_enabled = poly_config.get('enabled', False)
         current_markets = poly_config.get('markets', {})
         
-        print(f"\n    Current Polymarket status: {'Enabled' if current_enabled else 'Disabled'}")
+        buf.write(f"\n    Current Polymarket status: {'Enabled' if current_enabled else 'Disabled'}\n")
         if current_markets:
-            print(f"    Current IDs:")
+            buf.write("    Current IDs:\n")
             for key, value in current_markets.items():
-                print(f"      {key}: {value}")
+                buf.write(f"      {key}: {value}\n")
         
-        print(f"\n    Options:")
-        print(f"      1. Add Polymarket IDs")
-        print(f"      2. Skip (keep current)")
-        print(f"      3. Disable Polymarket for this market")
-        print(f"      q. Quit")
+        buf.write("\n    Options:\n")
+        buf.write("      1. Add Polymarket IDs\n")
+        buf.write("      2. Skip (keep current)\n")
+        buf.write("      3. Disable Polymarket for this market\n")
+        buf.write("      q. Quit\n")
+        sys.stdout.write(buf.getvalue())
         
         choice = input(f"\n    Choice [1/2/3/q]: ").strip().lower()
         
-        if choice == 'q' or choice == 'quit':
-            print("\nExiting...")
+        # Handlers return True to stop prompting; anything unrecognized is a skip
+        handler = _DISPATCH.get(choice, _handle_skip)
+        if handler(market):
             break
-        elif choice == '3' or choice == 'disable':
-            market['polymarket']['enabled'] = False
-            print("    ✓ Disabled Polymarket for this market")
-        elif choice == '1':
-            print(f"\n    Enter Polymarket condition IDs:")
-            print(f"    (Find these on polymarket.com by searching for the game)")
-            print(f"    (Leave blank to skip)")
-            
-            team_a = input(f"      {market['teams']['team_a']} ID: ").strip()
-            team_b = input(f"      {market['teams']['team_b']} ID: ").strip()
-            
-            if team_a or team_b:
-                if 'polymarket' not in market:
-                    market['polymarket'] = {}
-                if 'markets' not in market['polymarket']:
-                    market['polymarket']['markets'] = {}
-                
-                if team_a:
-                    market['polymarket']['markets']['team_a'] = team_a
-                if team_b:
-                    market['polymarket']['markets']['team_b'] = team_b
-                
-                # Ask if they want to enable
-                enable = input(f"      Enable Polymarket for this market? [y/n]: ").strip().lower()
-                market['polymarket']['enabled'] = enable == 'y' or enable == 'yes'
-                
-                print("    ✓ Added Polymarket IDs")
-            else:
-                print("    ⊘ Skipped (no IDs entered)")
-        else:
-            print("    ⊘ Skipped")
     
     return markets_data
 
@@ -18,11 +18,47 @@ Usage:
 """
 
 import argparse
+import io
+import json
 import sqlite3
+from bisect import bisect_left
 import sys
-from datetime import datetime, timedelta
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from collections import defaultdict
+from itertools import chain, groupby
+
+sys.path.append(str(Path(__file__).parent.parent))
+from db_setup import timestamp_to_epoch_us
+
+FETCH_BATCH_SIZE = 10000  # Snapshot rows pulled from SQLite per fetchmany()
+
+
+@dataclass
+class Opportunity:
+    """One matched Kalshi/Polymarket pair whose total cost is under $1"""
+    # Declared by hand: @dataclass(slots=True) needs Python 3.10+
+    __slots__ = ('timestamp', 'time_diff', 'kalshi_market', 'poly_market', 'kalshi_side',
+                 'poly_side', 'description', 'kalshi_price', 'poly_price', 'total_cost',
+                 'kalshi_fee', 'poly_fee', 'total_fees', 'gross_profit', 'net_profit', 'roi',
+                 'is_opportunity', 'is_profitable')
+    timestamp: str
+    time_diff: float  # Seconds between the matched snapshots
+    kalshi_market: str
+    poly_market: str
+    kalshi_side: str
+    poly_side: str
+    description: str
+    kalshi_price: float
+    poly_price: float
+    total_cost: float
+    kalshi_fee: float
+    poly_fee: float
+    total_fees: float
+    gross_profit: float
+    net_profit: float
+    roi: float
+    is_opportunity: bool
+    is_profitable: bool
 
 
 class ArbitrageAnalyzer:
@@ -32,11 +68,28 @@ class ArbitrageAnalyzer:
     KALSHI_FEE_PCT = 0.07  # 7%
     POLYMARKET_FEE_PCT = 0.02  # 2%
     
-    def __init__(self, db_path="data/market_data.db"):
+    # Complementary side combinations checked for every matched pair:
+    # (kalshi_side, poly_side, kalshi price column, poly price column, description)
+    SIDE_COMBINATIONS = (
+        ('yes', 'no', 'yes_price', 'no_price', "Kalshi YES + Polymarket NO"),
+        ('no', 'yes', 'no_price', 'yes_price', "Kalshi NO + Polymarket YES")
+    )
+    
+    # Price snapshot columns used by analyze_event. Prices are kept as the REAL
+    # (float64) values the logger stored: rounding to float32 or basis points would
+    # move the total_cost < $1 boundary and change the reported profits.
+    SNAPSHOT_COLUMNS = ('platform', 'market_id', 'yes_price', 'no_price', 'timestamp', 'ts_epoch')
+    
+    # Bump when analyze_event's output changes so older cached results are ignored
+    CACHE_VERSION = 1
+    
+    def __init__(self, db_path="data/market_data.db", use_cache=True, read_only=False):
         """Initialize analyzer
         
         Args:
             db_path: Path to SQLite database
+            use_cache: Reuse stored analyze_event results for unchanged events
+            read_only: Open the database read-only (worker processes); implies no cache
         """
         base_dir = Path(__file__).parent.parent
         self.db_path = base_dir / db_path
@@ -46,34 +99,185 @@ class ArbitrageAnalyzer:
             print(f"  Run data_logger.py first to collect data")
             sys.exit(1)
         
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
-        print(f"✓ Connected to database: {self.db_path}")
+        if read_only:
+            self.conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            self.conn.row_factory = sqlite3.Row
+            use_cache = False
+        else:
+            self.conn = sqlite3.connect(self.db_path)
+            self.conn.row_factory = sqlite3.Row
+            print(f"✓ Connected to database: {self.db_path}")
+        
+        # Large page cache and mmap for the snapshot scans (journal mode is left to db_setup)
+        self.conn.execute("PRAGMA cache_size=-262144")  # ~256 MB page cache
+        self.conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        
+        # Only load the snapshot columns the analysis reads (databases logged
+        # before ts_epoch existed get it as NULL and fall back to parsing)
+        existing = {row['name'] for row in self.conn.execute("PRAGMA table_info(price_snapshots)")}
+        self.snapshot_columns = [
+            column if column in existing else f"NULL AS {column}"
+            for column in self.SNAPSHOT_COLUMNS
+        ]
+        
+        self.use_cache = use_cache and self.create_cache_table()
+        
+        # Without the cache the analysis never writes, so refuse writes outright
+        if not self.use_cache:
+            self.conn.execute("PRAGMA query_only=1")
     
-    def get_price_snapshots(self, event_id=None):
-        """Get all price snapshots, optionally filtered by event
+    def create_cache_table(self):
+        """Create the analysis_cache table if needed
+        
+        Returns:
+            bool: True if the cache can be used (False for read-only databases)
+        """
+        try:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    event_id TEXT NOT NULL,
+                    window_seconds INTEGER NOT NULL,
+                    data_version TEXT NOT NULL,  -- snapshot count/max id + fees when analyzed
+                    result TEXT NOT NULL,  -- JSON analyze_event result
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (event_id, window_seconds)
+                )
+            """)
+            self.conn.commit()
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"⚠️  Analysis cache disabled: {e}")
+            return False
+    
+    def get_data_version(self, event_id):
+        """Fingerprint an event's snapshots for cache invalidation
+        
+        Snapshot ids only grow, so any insert changes MAX(id) and any delete
+        changes COUNT(*) - including backfilled or out-of-order timestamps.
         
         Args:
-            event_id: Optional event ID to filter
+            event_id: Event identifier
         
         Returns:
-            list: List of price snapshot dicts
+            str: Version string for the event's current data and fee settings
+        """
+        count, max_id = self.conn.execute(
+            "SELECT COUNT(*), MAX(id) FROM price_snapshots WHERE event_id = ?", (event_id,)
+        ).fetchone()
+        return f"v{self.CACHE_VERSION}:{self.KALSHI_FEE_PCT}:{self.POLYMARKET_FEE_PCT}:{count}:{max_id}"
+    
+    def load_cached_result(self, event_id, window_seconds, data_version):
+        """Get a stored analyze_event result if the event's data hasn't changed
+        
+        Returns:
+            dict: Cached result, or None if missing/stale
+        """
+        row = self.conn.execute("""
+            SELECT result FROM analysis_cache
+            WHERE event_id = ? AND window_seconds = ? AND data_version = ?
+        """, (event_id, window_seconds, data_version)).fetchone()
+        if not row:
+            return None
+        
+        # Opportunities are stored as plain JSON objects; rebuild the records
+        result = json.loads(row['result'])
+        if 'opportunities' in result:
+            result['opportunities'] = [Opportunity(**o) for o in result['opportunities']]
+        if result.get('best_opportunity'):
+            result['best_opportunity'] = Opportunity(**result['best_opportunity'])
+        return result
+    
+    def save_cached_result(self, event_id, window_seconds, data_version, result):
+        """Store an analyze_event result for later runs"""
+        self.conn.execute("""
+            INSERT OR REPLACE INTO analysis_cache
+            (event_id, window_seconds, data_version, result)
+            VALUES (?, ?, ?, ?)
+        """, (event_id, window_seconds, data_version, json.dumps(result, default=asdict)))
+        self.conn.commit()
+    
+    def iter_price_snapshots(self, event_id=None, columns=None, batch_size=FETCH_BATCH_SIZE):
+        """Stream price snapshots in batches, optionally filtered by event
+        
+        Args:
+            event_id: Optional event ID to filter
+            columns: Optional list of columns to select (default: all)
+            batch_size: Rows fetched from SQLite per batch
+        
+        Yields:
+            list: Batches of price snapshot dicts
         """
+        select = ', '.join(columns) if columns else '*'
+        
+        # Plain tuples are zipped straight into dicts (no sqlite3.Row per snapshot)
         cursor = self.conn.cursor()
+        cursor.row_factory = None
         
         if event_id:
-            cursor.execute("""
-                SELECT * FROM price_snapshots
+            cursor.execute(f"""
+                SELECT {select} FROM price_snapshots
                 WHERE event_id = ?
                 ORDER BY timestamp
             """, (event_id,))
         else:
-            cursor.execute("""
-                SELECT * FROM price_snapshots
+            cursor.execute(f"""
+                SELECT {select} FROM price_snapshots
                 ORDER BY event_id, timestamp
             """)
         
-        return [dict(row) for row in cursor.fetchall()]
+        names = [description[0] for description in cursor.description]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [dict(zip(names, row)) for row in rows]
+    
+    def get_price_snapshots(self, event_id=None, columns=None):
+        """Get all price snapshots, optionally filtered by event
+        
+        Args:
+            event_id: Optional event ID to filter
+            columns: Optional list of columns to select (default: all)
+        
+        Returns:
+            list: List of price snapshot dicts
+        """
+        return [
+            snapshot
+            for batch in self.iter_price_snapshots(event_id, columns)
+            for snapshot in batch
+        ]
+    
+    def iter_snapshots_by_event(self, event_ids, batch_size=FETCH_BATCH_SIZE):
+        """Stream the analysed snapshot columns for several events from one query
+        
+        Rows are read in batches and handed out one event at a time, so only a
+        single event's snapshots are held in memory.
+        
+        Args:
+            event_ids: Event IDs to load
+            batch_size: Rows fetched from SQLite per batch
+        
+        Yields:
+            tuple: (event_id, list of price snapshot dicts ordered by timestamp),
+                in event_id order
+        """
+        if not event_ids:
+            return
+        
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"""
+            SELECT event_id, {', '.join(self.snapshot_columns)} FROM price_snapshots
+            WHERE event_id IN ({', '.join('?' * len(event_ids))})
+            ORDER BY event_id, timestamp
+        """, list(event_ids))
+        
+        names = [description[0] for description in cursor.description][1:]
+        rows = chain.from_iterable(iter(lambda: cursor.fetchmany(batch_size), []))
+        for event_id, event_rows in groupby(rows, key=lambda row: row[0]):
+            yield event_id, [dict(zip(names, row[1:])) for row in event_rows]
     
     def get_tracked_markets(self):
         """Get all tracked markets
@@ -85,22 +289,22 @@ class ArbitrageAnalyzer:
         cursor.execute("SELECT * FROM tracked_markets WHERE enabled = 1")
         return [dict(row) for row in cursor.fetchall()]
     
-    def parse_timestamp(self, timestamp_str):
-        """Parse ISO timestamp string to datetime
+    def snapshot_epoch_us(self, snapshot):
+        """Get a snapshot's time as epoch microseconds
+        
+        Uses the ts_epoch column written at ingest; rows from databases that
+        predate it are parsed from the timestamp string instead.
         
         Args:
-            timestamp_str: ISO format timestamp string
+            snapshot: Price snapshot dict
         
         Returns:
-            datetime: Parsed datetime object
+            int: Epoch microseconds, or None if the timestamp can't be parsed
         """
-        # Handle various ISO formats
-        for fmt in ["%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"]:
-            try:
-                return datetime.strptime(timestamp_str.split('+')[0].split('Z')[0], fmt)
-            except ValueError:
-                continue
-        return None
+        ts_epoch = snapshot.get('ts_epoch')
+        if ts_epoch is not None:
+            return ts_epoch
+        return timestamp_to_epoch_us(snapshot['timestamp'])
     
     def find_time_matched_pairs(self, snapshots, window_seconds=5):
         """Find Kalshi/Polymarket price pairs within time window
@@ -110,38 +314,60 @@ class ArbitrageAnalyzer:
             window_seconds: Maximum time difference (seconds)
         
         Returns:
-            list: List of matched pairs (kalshi_snapshot, polymarket_snapshot, time_diff)
+            tuple: (matched pairs as (kalshi_snapshot, polymarket_snapshot, time_diff),
+                Kalshi snapshot count, Polymarket snapshot count)
         """
         # Separate by platform
         kalshi_snaps = [s for s in snapshots if s['platform'] == 'kalshi']
         poly_snaps = [s for s in snapshots if s['platform'] == 'polymarket']
         
+        # Parse each Polymarket timestamp once and sort by time. The sort is stable,
+        # so snapshots sharing a timestamp keep their original order.
+        poly_timed = []
+        for i, p_snap in enumerate(poly_snaps):
+            p_time = self.snapshot_epoch_us(p_snap)
+            if p_time is not None:
+                poly_timed.append((p_time, i, p_snap))
+        poly_timed.sort(key=lambda item: item[0])
+        poly_times = [p_time for p_time, _, _ in poly_timed]
+        
         matched_pairs = []
         
         for k_snap in kalshi_snaps:
-            k_time = self.parse_timestamp(k_snap['timestamp'])
-            if not k_time:
+            k_time = self.snapshot_epoch_us(k_snap)
+            if k_time is None:
                 continue
             
+            # Closest Polymarket snapshot is the first one at/after k_time or the
+            # first one at the latest time before it (binary search, not a full scan)
+            after = bisect_left(poly_times, k_time)
+            candidates = []
+            if after < len(poly_times):
+                candidates.append(after)
+            if after > 0:
+                candidates.append(bisect_left(poly_times, poly_times[after - 1]))
+            
             # Find closest Polymarket snapshot within window
+            # (ties go to whichever snapshot came first, as in a linear scan)
             best_match = None
             best_time_diff = float('inf')
+            best_order = None
             
-            for p_snap in poly_snaps:
-                p_time = self.parse_timestamp(p_snap['timestamp'])
-                if not p_time:
-                    continue
-                
-                time_diff = abs((k_time - p_time).total_seconds())
+            for position in candidates:
+                p_time, order, p_snap = poly_timed[position]
+                time_diff = abs(k_time - p_time) / 1000000
                 
-                if time_diff <= window_seconds and time_diff < best_time_diff:
+                if time_diff <= window_seconds and (
+                    time_diff < best_time_diff or (time_diff == best_time_diff and order < best_order)
+                ):
                     best_match = p_snap
                     best_time_diff = time_diff
+                    best_order = order
             
             if best_match:
                 matched_pairs.append((k_snap, best_match, best_time_diff))
         
-        return matched_pairs
+        return matched_pairs, len(kalshi_snaps), len(poly_snaps)
     
     def calculate_arbitrage(self, kalshi_price, poly_price, position_size=1.0):
         """Calculate arbitrage profit/loss
@@ -199,17 +425,28 @@ class ArbitrageAnalyzer:
             'is_profitable': is_profitable
         }
     
-    def analyze_event(self, event_id, window_seconds=5):
+    def analyze_event(self, event_id, window_seconds=5, snapshots=None, data_version=None):
         """Analyze one event for arbitrage opportunities
         
         Args:
             event_id: Event identifier
             window_seconds: Time matching window
+            snapshots: Preloaded price snapshots (queried here if None)
+            data_version: Cache version from get_data_version() when the caller
+                has already checked the cache (looked up here if None)
         
         Returns:
             dict: Analysis results
         """
-        snapshots = self.get_price_snapshots(event_id)
+        if self.use_cache and data_version is None:
+            data_version = self.get_data_version(event_id)
+            cached = self.load_cached_result(event_id, window_seconds, data_version)
+            if cached:
+                print("  ✓ Using cached results (no new snapshots)")
+                return cached
+        
+        if snapshots is None:
+            snapshots = self.get_price_snapshots(event_id, self.snapshot_columns)
         
         if not snapshots:
             return {
@@ -217,76 +454,83 @@ class ArbitrageAnalyzer:
                 'error': 'No price data found'
             }
         
-        # Find time-matched pairs
-        matched_pairs = self.find_time_matched_pairs(snapshots, window_seconds)
+        # Find time-matched pairs (platform counts come from the same partition)
+        matched_pairs, kalshi_count, poly_count = self.find_time_matched_pairs(snapshots, window_seconds)
         
         # Analyze each matched pair for arbitrage
         opportunities = []
         
+        # Hot loop: bind lookups to locals once per event rather than once per pair
+        side_combinations = self.SIDE_COMBINATIONS
+        calculate_arbitrage = self.calculate_arbitrage
+        add_opportunity = opportunities.append
+        
         for k_snap, p_snap, time_diff in matched_pairs:
             # We want complementary outcomes
             # If both are tracking the same outcome (e.g., Team A YES), we compare:
             # - Kalshi YES price vs Polymarket NO price
             # - Kalshi NO price vs Polymarket YES price
-            
-            # Try multiple combinations to find arbitrage
-            combinations = [
-                {
-                    'kalshi_side': 'yes',
-                    'poly_side': 'no',
-                    'kalshi_price': k_snap['yes_price'],
-                    'poly_price': p_snap['no_price'],
-                    'description': f"Kalshi YES + Polymarket NO"
-                },
-                {
-                    'kalshi_side': 'no',
-                    'poly_side': 'yes',
-                    'kalshi_price': k_snap['no_price'],
-                    'poly_price': p_snap['yes_price'],
-                    'description': f"Kalshi NO + Polymarket YES"
-                }
-            ]
-            
-            for combo in combinations:
-                arb = self.calculate_arbitrage(
-                    combo['kalshi_price'],
-                    combo['poly_price']
-                )
+            for kalshi_side, poly_side, kalshi_col, poly_col, description in side_combinations:
+                # Prune combinations that can't be opportunities (missing price or
+                # total cost >= $1) before building the full calculation. This is
+                # already the short-circuit for dead events: an event-level
+                # MIN(price) query costs more than the pruned scan it would skip,
+                # and matching has to run regardless for the matched_pairs count.
+                kalshi_price = k_snap[kalshi_col]
+                poly_price = p_snap[poly_col]
+                if kalshi_price is None or poly_price is None or kalshi_price + poly_price >= 1.0:
+                    continue
+                
+                arb = calculate_arbitrage(kalshi_price, poly_price)
                 
                 if arb and arb['is_opportunity']:
-                    opportunities.append({
-                        'timestamp': k_snap['timestamp'],
-                        'time_diff': time_diff,
-                        'kalshi_market': k_snap['market_id'],
-                        'poly_market': p_snap['market_id'],
-                        'kalshi_side': combo['kalshi_side'],
-                        'poly_side': combo['poly_side'],
-                        'description': combo['description'],
+                    add_opportunity(Opportunity(
+                        timestamp=k_snap['timestamp'],
+                        time_diff=time_diff,
+                        kalshi_market=k_snap['market_id'],
+                        poly_market=p_snap['market_id'],
+                        kalshi_side=kalshi_side,
+                        poly_side=poly_side,
+                        description=description,
                         **arb
-                    })
-        
-        # Calculate statistics
-        profitable_opps = [o for o in opportunities if o['is_profitable']]
-        
-        return {
+                    ))
+        
+        # Calculate statistics (best / totals in one pass; first max wins ties, like max())
+        profitable_opps = [o for o in opportunities if o.is_profitable]
+        best_opportunity = None
+        total_profit = 0
+        total_roi = 0
+        for opp in profitable_opps:
+            total_profit += opp.net_profit
+            total_roi += opp.roi
+            if best_opportunity is None or opp.net_profit > best_opportunity.net_profit:
+                best_opportunity = opp
+        
+        result = {
             'event_id': event_id,
             'total_snapshots': len(snapshots),
-            'kalshi_snapshots': len([s for s in snapshots if s['platform'] == 'kalshi']),
-            'poly_snapshots': len([s for s in snapshots if s['platform'] == 'polymarket']),
+            'kalshi_snapshots': kalshi_count,
+            'poly_snapshots': poly_count,
             'matched_pairs': len(matched_pairs),
             'opportunities_found': len(opportunities),
             'profitable_opportunities': len(profitable_opps),
             'opportunities': opportunities,
-            'best_opportunity': max(profitable_opps, key=lambda x: x['net_profit']) if profitable_opps else None,
-            'avg_profit': sum(o['net_profit'] for o in profitable_opps) / len(profitable_opps) if profitable_opps else 0,
-            'avg_roi': sum(o['roi'] for o in profitable_opps) / len(profitable_opps) if profitable_opps else 0
+            'best_opportunity': best_opportunity,
+            'avg_profit': total_profit / len(profitable_opps) if profitable_opps else 0,
+            'avg_roi': total_roi / len(profitable_opps) if profitable_opps else 0
         }
+        
+        if self.use_cache:
+            self.save_cached_result(event_id, window_seconds, data_version, result)
+        
+        return result
     
-    def analyze_all_events(self, window_seconds=5):
+    def analyze_all_events(self, window_seconds=5, workers=1):
         """Analyze all tracked events
         
         Args:
             window_seconds: Time matching window
+            workers: Worker processes for uncached events (1 = analyze in this process)
         
         Returns:
             dict: Complete analysis results
@@ -298,6 +542,41 @@ class ArbitrageAnalyzer:
         print(f"Time matching window: {window_seconds} seconds")
         print(f"{'=' * 70}\n")
         
+        # Check the cache up front, then stream every remaining event's snapshots
+        # from one shared query instead of a SELECT per event
+        cached_results = {}
+        data_versions = {}
+        if self.use_cache:
+            for market in markets:
+                event_id = market['event_id']
+                data_versions[event_id] = self.get_data_version(event_id)
+                cached = self.load_cached_result(event_id, window_seconds, data_versions[event_id])
+                if cached:
+                    cached_results[event_id] = cached
+        
+        pending = [market['event_id'] for market in markets if market['event_id'] not in cached_results]
+        
+        # Events are independent, so with several workers each uncached event is
+        # analyzed in its own process over a read-only connection
+        executor = None
+        futures = {}
+        if workers > 1 and len(pending) > 1:
+            # Imported here so single-process runs (and --help) skip multiprocessing's import cost
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(
+                max_workers=min(workers, len(pending)),
+                initializer=_init_worker,
+                initargs=(str(self.db_path),)
+            )
+            futures = {
+                event_id: executor.submit(_analyze_event_in_worker, event_id, window_seconds)
+                for event_id in pending
+            }
+            pending = []
+        
+        streamed = self.iter_snapshots_by_event(pending)
+        fresh_results = {}
+        
         results = []
         
         for market in markets:
@@ -305,7 +584,36 @@ class ArbitrageAnalyzer:
             description = market['description']
             
             print(f"Analyzing: {description}")
-            result = self.analyze_event(event_id, window_seconds)
+            if event_id in cached_results:
+                print("  ✓ Using cached results (no new snapshots)")
+                result = cached_results[event_id]
+            elif event_id in futures:
+                result = futures.pop(event_id).result()
+                if self.use_cache and not result.get('error'):
+                    self.save_cached_result(event_id, window_seconds, data_versions[event_id], result)
+            else:
+                # The shared query yields events in event_id order, not market order:
+                # analyze streamed events until this one arrives (results for later
+                # markets are kept, their snapshots are not)
+                for streamed_id, snapshots in streamed:
+                    fresh_results[streamed_id] = self.analyze_event(
+                        streamed_id,
+                        window_seconds,
+                        snapshots=snapshots,
+                        data_version=data_versions.get(streamed_id)
+                    )
+                    if streamed_id == event_id:
+                        break
+                
+                result = fresh_results.pop(event_id, None)
+                if result is None:
+                    # No snapshots at all for this event
+                    result = self.analyze_event(
+                        event_id,
+                        window_seconds,
+                        snapshots=[],
+                        data_version=data_versions.get(event_id)
+                    )
             result['description'] = description
             results.append(result)
             
@@ -319,9 +627,12 @@ class ArbitrageAnalyzer:
                 
                 if result['best_opportunity']:
                     best = result['best_opportunity']
-                    print(f"  💰 Best: ${best['net_profit']:.4f} profit ({best['roi']:.2f}% ROI)")
+                    print(f"  💰 Best: ${best.net_profit:.4f} profit ({best.roi:.2f}% ROI)")
             print()
         
+        if executor:
+            executor.shutdown()
+        
         return results
     
     def generate_report(self, results):
@@ -330,105 +641,123 @@ class ArbitrageAnalyzer:
         Args:
             results: Analysis results from analyze_all_events()
         """
-        print("\n" + "=" * 70)
-        print("ARBITRAGE ANALYSIS REPORT")
-        print("=" * 70)
-        
-        # Overall statistics
-        total_opportunities = sum(r.get('opportunities_found', 0) for r in results)
-        total_profitable = sum(r.get('profitable_opportunities', 0) for r in results)
-        total_snapshots = sum(r.get('total_snapshots', 0) for r in results)
-        
-        print(f"\nOverall Statistics:")
-        print(f"  Markets analyzed:          {len(results)}")
-        print(f"  Total price snapshots:     {total_snapshots}")
-        print(f"  Opportunities found:       {total_opportunities}")
-        print(f"  Profitable opportunities:  {total_profitable}")
+        # Build the whole report and write it once rather than a print per line
+        buf = io.StringIO()
+        
+        buf.write("\n" + "=" * 70 + "\n")
+        buf.write("ARBITRAGE ANALYSIS REPORT\n")
+        buf.write("=" * 70 + "\n")
+        
+        # Overall statistics (one pass over the per-market results)
+        total_opportunities = 0
+        total_profitable = 0
+        total_snapshots = 0
+        for r in results:
+            total_opportunities += r.get('opportunities_found', 0)
+            total_profitable += r.get('profitable_opportunities', 0)
+            total_snapshots += r.get('total_snapshots', 0)
+        
+        buf.write(f"\nOverall Statistics:\n")
+        buf.write(f"  Markets analyzed:          {len(results)}\n")
+        buf.write(f"  Total price snapshots:     {total_snapshots}\n")
+        buf.write(f"  Opportunities found:       {total_opportunities}\n")
+        buf.write(f"  Profitable opportunities:  {total_profitable}\n")
         
         if total_opportunities > 0:
             profit_rate = (total_profitable / total_opportunities) * 100
-            print(f"  Profitability rate:        {profit_rate:.1f}%")
+            buf.write(f"  Profitability rate:        {profit_rate:.1f}%\n")
         
         # Per-market details
-        print(f"\n{'─' * 70}")
-        print("Per-Market Analysis:")
-        print(f"{'─' * 70}")
+        buf.write(f"\n{'─' * 70}\n")
+        buf.write("Per-Market Analysis:\n")
+        buf.write(f"{'─' * 70}\n")
         
         for result in results:
             if result.get('error'):
-                print(f"\n❌ {result['description']}")
-                print(f"   Error: {result['error']}")
+                buf.write(f"\n❌ {result['description']}\n")
+                buf.write(f"   Error: {result['error']}\n")
                 continue
             
-            print(f"\n📊 {result['description']}")
-            print(f"   Event ID: {result['event_id']}")
-            print(f"   Data points: {result['kalshi_snapshots']} Kalshi, {result['poly_snapshots']} Polymarket")
-            print(f"   Time-matched pairs: {result['matched_pairs']}")
-            print(f"   Opportunities: {result['opportunities_found']} total, {result['profitable_opportunities']} profitable")
+            buf.write(f"\n📊 {result['description']}\n")
+            buf.write(f"   Event ID: {result['event_id']}\n")
+            buf.write(f"   Data points: {result['kalshi_snapshots']} Kalshi, {result['poly_snapshots']} Polymarket\n")
+            buf.write(f"   Time-matched pairs: {result['matched_pairs']}\n")
+            buf.write(f"   Opportunities: {result['opportunities_found']} total, {result['profitable_opportunities']} profitable\n")
             
             if result['profitable_opportunities'] > 0:
-                print(f"   Average profit: ${result['avg_profit']:.4f}")
-                print(f"   Average ROI: {result['avg_roi']:.2f}%")
+                buf.write(f"   Average profit: ${result['avg_profit']:.4f}\n")
+                buf.write(f"   Average ROI: {result['avg_roi']:.2f}%\n")
                 
                 best = result['best_opportunity']
-                print(f"\n   💰 Best Opportunity:")
-                print(f"      Timestamp: {best['timestamp']}")
-                print(f"      Strategy: {best['description']}")
-                print(f"      Kalshi price: ${best['kalshi_price']:.4f}")
-                print(f"      Polymarket price: ${best['poly_price']:.4f}")
-                print(f"      Total cost: ${best['total_cost']:.4f}")
-                print(f"      Fees: ${best['total_fees']:.4f}")
-                print(f"      Net profit: ${best['net_profit']:.4f}")
-                print(f"      ROI: {best['roi']:.2f}%")
+                buf.write(f"\n   💰 Best Opportunity:\n")
+                buf.write(f"      Timestamp: {best.timestamp}\n")
+                buf.write(f"      Strategy: {best.description}\n")
+                buf.write(f"      Kalshi price: ${best.kalshi_price:.4f}\n")
+                buf.write(f"      Polymarket price: ${best.poly_price:.4f}\n")
+                buf.write(f"      Total cost: ${best.total_cost:.4f}\n")
+                buf.write(f"      Fees: ${best.total_fees:.4f}\n")
+                buf.write(f"      Net profit: ${best.net_profit:.4f}\n")
+                buf.write(f"      ROI: {best.roi:.2f}%\n")
         
         # Conclusions
-        print(f"\n{'=' * 70}")
-        print("CONCLUSIONS")
-        print(f"{'=' * 70}")
+        buf.write(f"\n{'=' * 70}\n")
+        buf.write("CONCLUSIONS\n")
+        buf.write(f"{'=' * 70}\n")
         
         if total_profitable == 0:
-            print("\n❌ NO PROFITABLE ARBITRAGE OPPORTUNITIES FOUND")
-            print("\nPossible reasons:")
-            print("  1. Markets are efficient - prices are aligned")
-            print("  2. Fees (7% Kalshi + 2% Polymarket) eliminate profit margins")
-            print("  3. Not enough data collected yet")
-            print("  4. Time matching window too strict (try increasing --window)")
-            print("  5. Wrong market sides being compared")
+            buf.write("\n❌ NO PROFITABLE ARBITRAGE OPPORTUNITIES FOUND\n")
+            buf.write("\nPossible reasons:\n")
+            buf.write("  1. Markets are efficient - prices are aligned\n")
+            buf.write("  2. Fees (7% Kalshi + 2% Polymarket) eliminate profit margins\n")
+            buf.write("  3. Not enough data collected yet\n")
+            buf.write("  4. Time matching window too strict (try increasing --window)\n")
+            buf.write("  5. Wrong market sides being compared\n")
         else:
-            print(f"\n✅ FOUND {total_profitable} PROFITABLE OPPORTUNITIES")
+            buf.write(f"\n✅ FOUND {total_profitable} PROFITABLE OPPORTUNITIES\n")
             
-            # Calculate if opportunities last long enough
-            all_opps = []
+            # Profit and timing stats in one pass over every profitable opportunity
+            profitable_count = 0
+            profit_sum = 0
+            max_profit = float('-inf')
+            time_diff_sum = 0
+            min_time_diff = float('inf')
+            max_time_diff = float('-inf')
             for r in results:
-                all_opps.extend(r.get('opportunities', []))
+                for o in r.get('opportunities', []):
+                    if not o.is_profitable:
+                        continue
+                    profitable_count += 1
+                    profit_sum += o.net_profit
+                    max_profit = max(max_profit, o.net_profit)
+                    time_diff_sum += o.time_diff
+                    min_time_diff = min(min_time_diff, o.time_diff)
+                    max_time_diff = max(max_time_diff, o.time_diff)
             
-            profitable_opps = [o for o in all_opps if o['is_profitable']]
-            avg_profit = sum(o['net_profit'] for o in profitable_opps) / len(profitable_opps)
-            max_profit = max(o['net_profit'] for o in profitable_opps)
+            avg_profit = profit_sum / profitable_count
             
-            print(f"\n   Average profit: ${avg_profit:.4f} per opportunity")
-            print(f"   Maximum profit: ${max_profit:.4f}")
+            buf.write(f"\n   Average profit: ${avg_profit:.4f} per opportunity\n")
+            buf.write(f"   Maximum profit: ${max_profit:.4f}\n")
             
             # Duration analysis
-            time_diffs = [o['time_diff'] for o in profitable_opps]
-            avg_time_diff = sum(time_diffs) / len(time_diffs)
+            avg_time_diff = time_diff_sum / profitable_count
             
-            print(f"\n   Timing Analysis:")
-            print(f"   Average time between snapshots: {avg_time_diff:.1f} seconds")
-            print(f"   Min time difference: {min(time_diffs):.1f} seconds")
-            print(f"   Max time difference: {max(time_diffs):.1f} seconds")
+            buf.write(f"\n   Timing Analysis:\n")
+            buf.write(f"   Average time between snapshots: {avg_time_diff:.1f} seconds\n")
+            buf.write(f"   Min time difference: {min_time_diff:.1f} seconds\n")
+            buf.write(f"   Max time difference: {max_time_diff:.1f} seconds\n")
             
             if avg_time_diff < 2:
-                print("\n   ⚡ Opportunities exist within 2-second windows!")
-                print("      This requires FAST execution.")
+                buf.write("\n   ⚡ Opportunities exist within 2-second windows!\n")
+                buf.write("      This requires FAST execution.\n")
             elif avg_time_diff < 5:
-                print("\n   ⏱️  Opportunities exist within 5-second windows")
-                print("      Fast execution required, but feasible.")
+                buf.write("\n   ⏱️  Opportunities exist within 5-second windows\n")
+                buf.write("      Fast execution required, but feasible.\n")
             else:
-                print("\n   ⏳ Opportunities last several seconds")
-                print("      Should be executable with normal API calls.")
+                buf.write("\n   ⏳ Opportunities last several seconds\n")
+                buf.write("      Should be executable with normal API calls.\n")
         
-        print(f"\n{'=' * 70}\n")
+        buf.write(f"\n{'=' * 70}\n\n")
+        sys.stdout.write(buf.getvalue())
     
     def close(self):
         """Close database connection"""
@@ -436,6 +765,21 @@ class ArbitrageAnalyzer:
             self.conn.close()
 
 
+# Per-process analyzer for analyze_all_events(workers > 1)
+_worker_analyzer = None
+
+
+def _init_worker(db_path):
+    """Open a read-only analyzer in a worker process"""
+    global _worker_analyzer
+    _worker_analyzer = ArbitrageAnalyzer(db_path=db_path, read_only=True)
+
+
+def _analyze_event_in_worker(event_id, window_seconds):
+    """Analyze one event with the worker process's analyzer"""
+    return _worker_analyzer.analyze_event(event_id, window_seconds)
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -446,6 +790,8 @@ Examples:
   python analyze_opportunities.py
   python analyze_opportunities.py --db ../data/market_data.db
   python analyze_opportunities.py --window 10
+  python analyze_opportunities.py --no-cache
+  python analyze_opportunities.py --workers 4
 
 This script analyzes data AFTER collection is complete.
 Run data_logger.py first to collect price data.
@@ -466,13 +812,26 @@ Run data_logger.py first to collect price data.
         help="Time matching window in seconds (default: 5)"
     )
     
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for analyzing events in parallel (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-analyze every event instead of reusing cached results"
+    )
+    
     args = parser.parse_args()
     
     # Create analyzer
-    analyzer = ArbitrageAnalyzer(db_path=args.db)
+    analyzer = ArbitrageAnalyzer(db_path=args.db, use_cache=not args.no_cache)
     
     # Run analysis
-    results = analyzer.analyze_all_events(window_seconds=args.window)
+    results = analyzer.analyze_all_events(window_seconds=args.window, workers=args.workers)
     
     # Generate report
     analyzer.generate_report(results)
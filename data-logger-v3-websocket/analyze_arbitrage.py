@@ -15,15 +15,28 @@ We look for opportunities in both directions:
 2. Buy Polymarket, Sell Kalshi YES
 """
 
+import io
 import sqlite3
+import sys
 from datetime import datetime, timedelta
 import json
 
+# Use orjson to write the report when it's installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class ArbitrageAnalyzer:
     def __init__(self, db_path="data/market_data.db"):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        
+        # Pure reader: open read-only (no write locks) with a large page cache and mmap
+        self.conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
         self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA cache_size=-131072")  # ~128 MB page cache
+        self.conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        self.conn.execute("PRAGMA temp_store=MEMORY")
         
         # Fee assumptions
         self.kalshi_fee = 0.07  # 7% on profits
@@ -46,7 +59,9 @@ class ArbitrageAnalyzer:
         print(f"Polymarket Fee: {self.polymarket_fee*100}% on profits")
         print("=" * 80)
         
-        # Get all price pairs within time windows
+        # Get price pairs within time windows. The profit math is pushed into the
+        # WHERE clause (same arithmetic as the loop below), so only pairs that clear
+        # min_profit_pct in at least one direction leave SQLite.
         query = """
         WITH kalshi_prices AS (
             SELECT 
@@ -61,7 +76,7 @@ class ArbitrageAnalyzer:
             FROM price_snapshots ps
             JOIN tracked_markets tm ON ps.event_id = tm.event_id
             WHERE ps.platform = 'kalshi'
-                AND ps.timestamp > datetime('now', '-' || ? || ' hours')
+                AND ps.timestamp > datetime('now', '-' || :lookback_hours || ' hours')
                 AND ps.yes_ask IS NOT NULL
                 AND ps.yes_bid IS NOT NULL
                 AND tm.description NOT LIKE '%Lakers%'
@@ -74,12 +89,14 @@ class ArbitrageAnalyzer:
                 ps.yes_price as p_price,
                 ps.yes_bid as p_bid,
                 ps.yes_ask as p_ask,
+                CASE WHEN ps.yes_bid THEN ps.yes_bid ELSE ps.yes_price END as p_sell,
+                CASE WHEN ps.yes_ask THEN ps.yes_ask ELSE ps.yes_price END as p_buy,
                 ps.timestamp,
                 ps.volume as p_volume
             FROM price_snapshots ps
             JOIN tracked_markets tm ON ps.event_id = tm.event_id
             WHERE ps.platform = 'polymarket'
-                AND ps.timestamp > datetime('now', '-' || ? || ' hours')
+                AND ps.timestamp > datetime('now', '-' || :lookback_hours || ' hours')
                 AND tm.description NOT LIKE '%Lakers%'
         )
         SELECT 
@@ -101,111 +118,126 @@ class ArbitrageAnalyzer:
             ON k.event_id = p.event_id
             AND k.market_side = p.market_side
         WHERE time_diff_seconds <= 60
+            AND k.k_bid AND k.k_ask AND p.p_price
+            AND (
+                -- Buy Kalshi at ask, sell Polymarket at bid/price
+                (p.p_sell - k.k_ask > 0 AND
+                 CASE WHEN k.k_ask > 0 THEN
+                     (p.p_sell - k.k_ask - (1 - k.k_ask) * :kalshi_fee
+                      - CASE WHEN p.p_sell > 0 THEN p.p_sell * :polymarket_fee ELSE 0 END) / k.k_ask * 100
+                 ELSE 0 END >= :min_profit_pct)
+                OR
+                -- Buy Polymarket at ask/price, sell Kalshi at bid
+                (k.k_bid - p.p_buy > 0 AND
+                 CASE WHEN p.p_buy > 0 THEN
+                     (k.k_bid - p.p_buy - (1 - p.p_buy) * :polymarket_fee
+                      - CASE WHEN k.k_bid > 0 THEN k.k_bid * :kalshi_fee ELSE 0 END) / p.p_buy * 100
+                 ELSE 0 END >= :min_profit_pct)
+            )
         ORDER BY k.timestamp DESC;
         """
         
         cursor = self.conn.cursor()
-        cursor.execute(query, (lookback_hours, lookback_hours))
-        rows = cursor.fetchall()
-        
-        print(f"\n📊 Found {len(rows)} price pairs to analyze...")
+        cursor.row_factory = None  # Plain tuples, unpacked positionally below
+        cursor.execute(query, {
+            'lookback_hours': lookback_hours,
+            'kalshi_fee': self.kalshi_fee,
+            'polymarket_fee': self.polymarket_fee,
+            'min_profit_pct': min_profit_pct
+        })
         
-        # Analyze each pair
+        # Analyze each pair (fees hoisted out of the per-row loop). Only rows that already
+        # cleared the profit filter in SQL get here, so this loop is ~1% of the runtime;
+        # the time goes into the join above. Rows are streamed off the cursor rather than
+        # fetched into a list first, so memory stays flat for long lookbacks.
         opportunities = []
+        candidates = 0
+        kalshi_fee = self.kalshi_fee
+        polymarket_fee = self.polymarket_fee
         
-        for row in rows:
-            # Extract data
-            game = row['description']
-            team = row['market_side']
-            k_bid = row['k_bid']
-            k_ask = row['k_ask']
-            k_mid = row['k_mid']
-            p_price = row['p_price']
-            p_bid = row['p_bid']
-            p_ask = row['p_ask']
-            k_time = row['k_time']
-            p_time = row['p_time']
-            time_diff = row['time_diff_seconds']
+        for row in cursor:
+            candidates += 1
+            
+            # Extract data (in SELECT column order)
+            (game, team, k_time, p_time, k_bid, k_ask, k_mid, k_volume,
+             p_price, p_bid, p_ask, p_volume, time_diff) = row
             
             # Skip if missing key data
-            if not all([k_bid, k_ask, p_price]):
+            if not (k_bid and k_ask and p_price):
                 continue
             
             # OPPORTUNITY 1: Buy Kalshi YES (at ask), Sell Polymarket (at bid or price)
             # We buy YES on Kalshi, and sell the equivalent on Polymarket
             # Polymarket doesn't always have bid/ask, so use price if needed
-            poly_sell_price = p_bid if p_bid else p_price
+            # (p_price is set, so there is always a Polymarket sell price)
+            buy_price = k_ask  # Buy on Kalshi
+            sell_price = p_bid if p_bid else p_price  # Sell on Polymarket
+            
+            # Calculate profit (per $1 bet)
+            gross_profit = sell_price - buy_price
             
-            if poly_sell_price and k_ask:
-                buy_price = k_ask  # Buy on Kalshi
-                sell_price = poly_sell_price  # Sell on Polymarket
+            # Calculate fees (on profit only)
+            if gross_profit > 0:
+                # Kalshi fee on winnings
+                kalshi_fee_cost = (1 - buy_price) * kalshi_fee  # Fee on the win amount
+                # Polymarket fee on winnings
+                poly_fee_cost = sell_price * polymarket_fee if sell_price > 0 else 0
                 
-                # Calculate profit (per $1 bet)
-                gross_profit = sell_price - buy_price
+                net_profit = gross_profit - kalshi_fee_cost - poly_fee_cost
+                profit_pct = (net_profit / buy_price) * 100 if buy_price > 0 else 0
                 
-                # Calculate fees (on profit only)
-                if gross_profit > 0:
-                    # Kalshi fee on winnings
-                    kalshi_fee_cost = (1 - buy_price) * self.kalshi_fee  # Fee on the win amount
-                    # Polymarket fee on winnings  
-                    poly_fee_cost = (sell_price - 0) * self.polymarket_fee if sell_price > 0 else 0
-                    
-                    net_profit = gross_profit - kalshi_fee_cost - poly_fee_cost
-                    profit_pct = (net_profit / buy_price) * 100 if buy_price > 0 else 0
-                    
-                    if profit_pct >= min_profit_pct:
-                        opportunities.append({
-                            'game': game,
-                            'team': team,
-                            'direction': 'Buy Kalshi → Sell Poly',
-                            'buy_platform': 'Kalshi',
-                            'sell_platform': 'Polymarket',
-                            'buy_price': buy_price,
-                            'sell_price': sell_price,
-                            'gross_profit': gross_profit,
-                            'net_profit': net_profit,
-                            'profit_pct': profit_pct,
-                            'k_time': k_time,
-                            'p_time': p_time,
-                            'time_diff': time_diff,
-                            'k_volume': row['k_volume'],
-                            'p_volume': row['p_volume']
-                        })
+                if profit_pct >= min_profit_pct:
+                    opportunities.append({
+                        'game': game,
+                        'team': team,
+                        'direction': 'Buy Kalshi → Sell Poly',
+                        'buy_platform': 'Kalshi',
+                        'sell_platform': 'Polymarket',
+                        'buy_price': buy_price,
+                        'sell_price': sell_price,
+                        'gross_profit': gross_profit,
+                        'net_profit': net_profit,
+                        'profit_pct': profit_pct,
+                        'k_time': k_time,
+                        'p_time': p_time,
+                        'time_diff': time_diff,
+                        'k_volume': k_volume,
+                        'p_volume': p_volume
+                    })
             
             # OPPORTUNITY 2: Buy Polymarket, Sell Kalshi YES (at bid)
-            poly_buy_price = p_ask if p_ask else p_price
+            buy_price = p_ask if p_ask else p_price  # Buy on Polymarket
+            sell_price = k_bid  # Sell on Kalshi
+            
+            gross_profit = sell_price - buy_price
             
-            if poly_buy_price and k_bid:
-                buy_price = poly_buy_price  # Buy on Polymarket
-                sell_price = k_bid  # Sell on Kalshi
+            if gross_profit > 0:
+                poly_fee_cost = (1 - buy_price) * polymarket_fee
+                kalshi_fee_cost = sell_price * kalshi_fee if sell_price > 0 else 0
                 
-                gross_profit = sell_price - buy_price
+                net_profit = gross_profit - poly_fee_cost - kalshi_fee_cost
+                profit_pct = (net_profit / buy_price) * 100 if buy_price > 0 else 0
                 
-                if gross_profit > 0:
-                    poly_fee_cost = (1 - buy_price) * self.polymarket_fee
-                    kalshi_fee_cost = sell_price * self.kalshi_fee if sell_price > 0 else 0
-                    
-                    net_profit = gross_profit - poly_fee_cost - kalshi_fee_cost
-                    profit_pct = (net_profit / buy_price) * 100 if buy_price > 0 else 0
-                    
-                    if profit_pct >= min_profit_pct:
-                        opportunities.append({
-                            'game': game,
-                            'team': team,
-                            'direction': 'Buy Poly → Sell Kalshi',
-                            'buy_platform': 'Polymarket',
-                            'sell_platform': 'Kalshi',
-                            'buy_price': buy_price,
-                            'sell_price': sell_price,
-                            'gross_profit': gross_profit,
-                            'net_profit': net_profit,
-                            'profit_pct': profit_pct,
-                            'k_time': k_time,
-                            'p_time': p_time,
-                            'time_diff': time_diff,
-                            'k_volume': row['k_volume'],
-                            'p_volume': row['p_volume']
-                        })
+                if profit_pct >= min_profit_pct:
+                    opportunities.append({
+                        'game': game,
+                        'team': team,
+                        'direction': 'Buy Poly → Sell Kalshi',
+                        'buy_platform': 'Polymarket',
+                        'sell_platform': 'Kalshi',
+                        'buy_price': buy_price,
+                        'sell_price': sell_price,
+                        'gross_profit': gross_profit,
+                        'net_profit': net_profit,
+                        'profit_pct': profit_pct,
+                        'k_time': k_time,
+                        'p_time': p_time,
+                        'time_diff': time_diff,
+                        'k_volume': k_volume,
+                        'p_volume': p_volume
+                    })
+        
+        print(f"\n📊 Found {candidates} candidate price pairs to analyze...")
         
         return opportunities
     
@@ -224,55 +256,65 @@ class ArbitrageAnalyzer:
         # Sort by profit percentage
         opportunities.sort(key=lambda x: x['profit_pct'], reverse=True)
         
-        print(f"\n🎯 FOUND {len(opportunities)} ARBITRAGE OPPORTUNITIES!")
-        print("=" * 80)
+        # Build the whole listing in memory and write it once; with hundreds of
+        # opportunities, per-line print() calls dominate when stdout is a file or pipe
+        buf = io.StringIO()
+        
+        buf.write(f"\n🎯 FOUND {len(opportunities)} ARBITRAGE OPPORTUNITIES!\n")
+        buf.write("=" * 80 + "\n")
         
         for i, opp in enumerate(opportunities, 1):
-            print(f"\n📈 Opportunity #{i}")
-            print(f"   Game: {opp['game']}")
-            print(f"   Team: {opp['team']}")
-            print(f"   Strategy: {opp['direction']}")
-            print(f"   ")
-            print(f"   💰 BUY  on {opp['buy_platform']:12s} at ${opp['buy_price']:.3f}")
-            print(f"   💵 SELL on {opp['sell_platform']:12s} at ${opp['sell_price']:.3f}")
-            print(f"   ")
-            print(f"   📊 Gross Profit:  ${opp['gross_profit']:.4f} ({opp['gross_profit']*100:.2f}%)")
-            print(f"   💸 After Fees:    ${opp['net_profit']:.4f} ({opp['profit_pct']:.2f}%)")
-            print(f"   ")
-            print(f"   🕐 Kalshi Time:   {opp['k_time']}")
-            print(f"   🕐 Poly Time:     {opp['p_time']}")
-            print(f"   ⏱️  Time Diff:     {opp['time_diff']} seconds")
-            print(f"   📊 Volumes:       K=${opp['k_volume']:,.0f} | P=${opp['p_volume']:,.0f}")
+            buf.write(f"\n📈 Opportunity #{i}\n")
+            buf.write(f"   Game: {opp['game']}\n")
+            buf.write(f"   Team: {opp['team']}\n")
+            buf.write(f"   Strategy: {opp['direction']}\n")
+            buf.write(f"   \n")
+            buf.write(f"   💰 BUY  on {opp['buy_platform']:12s} at ${opp['buy_price']:.3f}\n")
+            buf.write(f"   💵 SELL on {opp['sell_platform']:12s} at ${opp['sell_price']:.3f}\n")
+            buf.write(f"   \n")
+            buf.write(f"   📊 Gross Profit:  ${opp['gross_profit']:.4f} ({opp['gross_profit']*100:.2f}%)\n")
+            buf.write(f"   💸 After Fees:    ${opp['net_profit']:.4f} ({opp['profit_pct']:.2f}%)\n")
+            buf.write(f"   \n")
+            buf.write(f"   🕐 Kalshi Time:   {opp['k_time']}\n")
+            buf.write(f"   🕐 Poly Time:     {opp['p_time']}\n")
+            buf.write(f"   ⏱️  Time Diff:     {opp['time_diff']} seconds\n")
+            buf.write(f"   📊 Volumes:       K=${opp['k_volume']:,.0f} | P=${opp['p_volume']:,.0f}\n")
             
             if i < len(opportunities):
-                print(f"   {'-' * 76}")
+                buf.write(f"   {'-' * 76}\n")
         
-        print("\n" + "=" * 80)
+        buf.write("\n" + "=" * 80 + "\n")
         
         # Summary statistics
         avg_profit = sum(o['profit_pct'] for o in opportunities) / len(opportunities)
         max_profit = max(o['profit_pct'] for o in opportunities)
         total_opportunities = len(opportunities)
         
-        print("\n📊 SUMMARY STATISTICS")
-        print("=" * 80)
-        print(f"Total Opportunities:  {total_opportunities}")
-        print(f"Average Profit:       {avg_profit:.2f}%")
-        print(f"Best Profit:          {max_profit:.2f}%")
-        print(f"")
+        buf.write("\n📊 SUMMARY STATISTICS\n")
+        buf.write("=" * 80 + "\n")
+        buf.write(f"Total Opportunities:  {total_opportunities}\n")
+        buf.write(f"Average Profit:       {avg_profit:.2f}%\n")
+        buf.write(f"Best Profit:          {max_profit:.2f}%\n")
+        buf.write(f"\n")
         
         # Count by direction
         buy_kalshi = sum(1 for o in opportunities if o['buy_platform'] == 'Kalshi')
         buy_poly = sum(1 for o in opportunities if o['buy_platform'] == 'Polymarket')
         
-        print(f"Buy Kalshi → Sell Poly:  {buy_kalshi} opportunities")
-        print(f"Buy Poly → Sell Kalshi:  {buy_poly} opportunities")
-        print("=" * 80)
+        buf.write(f"Buy Kalshi → Sell Poly:  {buy_kalshi} opportunities\n")
+        buf.write(f"Buy Poly → Sell Kalshi:  {buy_poly} opportunities\n")
+        buf.write("=" * 80 + "\n")
+        
+        sys.stdout.write(buf.getvalue())
     
     def save_report(self, opportunities, filename="arbitrage_report.json"):
         """Save opportunities to JSON file"""
-        with open(filename, 'w') as f:
-            json.dump(opportunities, f, indent=2)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(opportunities, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(opportunities, f, indent=2)
         print(f"\n💾 Report saved to: {filename}")
     
     def close(self):
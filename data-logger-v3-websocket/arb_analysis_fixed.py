@@ -42,12 +42,21 @@ print("=" * 80)
 print("🔍 ARBITRAGE ANALYSIS (WITH TEAM MAPPING)")
 print("=" * 80)
 
-conn = sqlite3.connect("data/market_data.db")
+# Pure reader: open read-only (no write locks) with a large page cache and mmap
+conn = sqlite3.connect("file:data/market_data.db?mode=ro", uri=True)
 conn.row_factory = sqlite3.Row
+conn.execute("PRAGMA cache_size=-131072")  # ~128 MB page cache
+conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+conn.execute("PRAGMA temp_store=MEMORY")
 
 # Get latest prices for each platform
 print("\n📊 Loading latest prices...")
 
+# The MAX(id) subquery is uncorrelated: SQLite evaluates it once per query as a
+# covering scan of idx_price_snapshots_side_time, then fetches each latest row by
+# rowid. A ROW_NUMBER() OVER (PARTITION BY event_id, market_side ORDER BY id DESC)
+# rewrite has to materialize and sort every candidate row instead, and measured
+# 1.2-6x slower, with or without the 24h filter moved inside the window.
 query_kalshi = """
 SELECT 
     ps.event_id,
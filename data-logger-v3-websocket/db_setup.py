@@ -16,6 +16,43 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+EPOCH = datetime(1970, 1, 1)
+
+# PRAGMA user_version once ts_epoch has been added and backfilled
+TS_EPOCH_SCHEMA_VERSION = 1
+TS_EPOCH_BACKFILL_BATCH = 10000
+
+
+def timestamp_to_epoch_us(timestamp_str):
+    """Convert an ISO timestamp string to integer epoch microseconds
+    
+    Any UTC offset / 'Z' suffix is dropped and the wall-clock time is taken as UTC,
+    matching how the analysis scripts have always read these timestamps.
+    
+    Args:
+        timestamp_str: ISO format timestamp string
+    
+    Returns:
+        int: Microseconds since 1970-01-01, or None if it can't be parsed
+    """
+    if not isinstance(timestamp_str, str):
+        return None
+    # fromisoformat is a single C call; before 3.11 it rejects 'Z' and fractional
+    # seconds other than 3 or 6 digits, so those fall back to the strptime formats
+    try:
+        parsed = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        for fmt in ["%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"]:
+            try:
+                parsed = datetime.strptime(timestamp_str.split('+')[0].split('Z')[0], fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+    delta = parsed - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
 
 class DatabaseManager:
     """Manages all database operations for the data logger"""
@@ -88,12 +125,16 @@ class DatabaseManager:
                 
                 -- Metadata
                 timestamp TEXT NOT NULL,
+                ts_epoch INTEGER,  -- timestamp as epoch microseconds (derived at ingest)
                 collection_time TEXT DEFAULT CURRENT_TIMESTAMP,
                 
                 FOREIGN KEY (event_id) REFERENCES tracked_markets(event_id)
             )
         """)
         
+        # Databases created before ts_epoch existed get the column added and backfilled (once)
+        self.backfill_ts_epoch()
+        
         # Index for fast time-based queries
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_price_snapshots_time 
@@ -105,6 +146,25 @@ class DatabaseManager:
             ON price_snapshots(event_id, platform)
         """)
         
+        # Returns one event's rows already in timestamp order, so per-timestamp
+        # GROUP BY pivots (tradeability_analysis) need no sort step
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_price_snapshots_event_time 
+            ON price_snapshots(event_id, timestamp)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_price_snapshots_event_epoch 
+            ON price_snapshots(event_id, ts_epoch)
+        """)
+        
+        # Lets the analysis scripts' same-event/same-side price joins seek straight to
+        # one market side's rows in the lookback window instead of scanning the event
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_price_snapshots_side_time 
+            ON price_snapshots(event_id, platform, market_side, timestamp)
+        """)
+        
         # Table 3: Arbitrage Opportunities
         # Stores detected arbitrage opportunities for later analysis
         cursor.execute("""
@@ -201,6 +261,57 @@ class DatabaseManager:
         self.conn.commit()
         print("✓ All tables created successfully")
     
+    def backfill_ts_epoch(self):
+        """Add the ts_epoch column if missing and fill it for rows logged without one
+        
+        Runs once per database: completion is recorded in PRAGMA user_version, so later
+        startups skip the scan. Rows are processed in id order, one committed batch at a
+        time, so an interrupted backfill resumes where it stopped.
+        
+        Returns:
+            int: Number of rows backfilled
+        """
+        cursor = self.conn.cursor()
+        
+        if cursor.execute("PRAGMA user_version").fetchone()[0] >= TS_EPOCH_SCHEMA_VERSION:
+            return 0
+        
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(price_snapshots)")}
+        if 'ts_epoch' not in columns:
+            cursor.execute("ALTER TABLE price_snapshots ADD COLUMN ts_epoch INTEGER")
+        
+        backfilled = 0
+        last_id = 0
+        while True:
+            cursor.execute("""
+                SELECT id, timestamp FROM price_snapshots
+                WHERE id > ? AND ts_epoch IS NULL
+                ORDER BY id
+                LIMIT ?
+            """, (last_id, TS_EPOCH_BACKFILL_BATCH))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            
+            updates = []
+            for snapshot_id, timestamp in rows:
+                ts_epoch = timestamp_to_epoch_us(timestamp)
+                if ts_epoch is not None:
+                    updates.append((ts_epoch, snapshot_id))
+            
+            cursor.executemany("UPDATE price_snapshots SET ts_epoch = ? WHERE id = ?", updates)
+            self.conn.commit()
+            backfilled += len(updates)
+        
+        if backfilled:
+            print(f"✓ Backfilled ts_epoch for {backfilled} price snapshot(s)")
+        
+        # Unparseable timestamps stay NULL; they are not rescanned on every startup
+        cursor.execute(f"PRAGMA user_version = {TS_EPOCH_SCHEMA_VERSION}")
+        self.conn.commit()
+        return backfilled
+    
     def add_tracked_market(self, event_id, description, sport=None, event_date=None,
                           teams=None, kalshi_markets=None, polymarket_markets=None):
         """Add a market to track
@@ -263,12 +374,12 @@ class DatabaseManager:
         cursor.execute("""
             INSERT INTO price_snapshots
             (event_id, platform, market_id, market_side, yes_price, no_price,
-             yes_bid, yes_ask, no_bid, no_ask, volume, liquidity, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             yes_bid, yes_ask, no_bid, no_ask, volume, liquidity, timestamp, ts_epoch)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             event_id, platform, market_id, market_side,
             yes_price, no_price, yes_bid, yes_ask, no_bid, no_ask,
-            volume, liquidity, timestamp
+            volume, liquidity, timestamp, timestamp_to_epoch_us(timestamp)
         ))
         
         self.conn.commit()
@@ -27,7 +27,6 @@ print("=" * 80)
 print("\nAnalyzing how long opportunities lasted throughout the data...\n")
 
 conn = sqlite3.connect("data/market_data.db")
-conn.row_factory = sqlite3.Row
 
 # Focus on the two opportunities we found
 target_games = [
@@ -93,39 +92,40 @@ for k_team, p_team, game_desc in target_games:
         continue
     
     print(f"\n⏰ Time range:")
-    print(f"   Kalshi: {kalshi_snaps[0]['timestamp']} to {kalshi_snaps[-1]['timestamp']}")
-    print(f"   Polymarket: {poly_snaps[0]['timestamp']} to {poly_snaps[-1]['timestamp']}")
+    print(f"   Kalshi: {kalshi_snaps[0][4]} to {kalshi_snaps[-1][4]}")
+    print(f"   Polymarket: {poly_snaps[0][4]} to {poly_snaps[-1][4]}")
     
     # Find all instances where arbitrage existed
     # For each Kalshi snapshot, find the closest Polymarket snapshot in time
     
     opportunities = []
     
-    for k_snap in kalshi_snaps:
-        k_bid = k_snap['yes_bid']
-        k_time = int(k_snap['ts_unix'])
-        k_timestamp = k_snap['timestamp']
-        
+    # Rows are plain tuples (no row_factory) - unpack positionally.
+    # Polymarket: (yes_price, timestamp, ts_unix) converted once up front
+    poly_points = [(int(p_ts), p_yes, p_timestamp)
+                   for p_yes, _, _, _, p_timestamp, p_ts in poly_snaps]
+    
+    for k_bid, _, _, _, k_timestamp, k_ts in kalshi_snaps:
         if not k_bid:
             continue
         
+        k_time = int(k_ts)
+        
         # Find closest Polymarket snapshot (within 60 seconds)
         closest_p = None
         min_time_diff = 61  # Start at 61 to ensure we only get within 60 sec
         
-        for p_snap in poly_snaps:
-            p_time = int(p_snap['ts_unix'])
-            time_diff = abs(k_time - p_time)
+        for p_point in poly_points:
+            time_diff = abs(k_time - p_point[0])
             
             if time_diff < min_time_diff:
                 min_time_diff = time_diff
-                closest_p = p_snap
+                closest_p = p_point
         
         if not closest_p or min_time_diff > 60:
             continue
         
-        p_price = closest_p['yes_price']
-        p_timestamp = closest_p['timestamp']
+        _, p_price, p_timestamp = closest_p
         
         if not p_price:
             continue
@@ -16,8 +16,36 @@ Documentation: https://docs.polymarket.com/
 
 import requests
 import time
+from bisect import bisect_left
 from datetime import datetime
+from itertools import accumulate
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_probe_session():
+    """Pooled session for the standalone Polymarket probe scripts
+    
+    Gamma -> CLOB calls reuse TCP/TLS connections, and rate limits and
+    transient 5xx are retried with exponential backoff (honoring
+    Retry-After). The last response is returned rather than raised, so
+    the scripts can still print its status code.
+    
+    Returns:
+        requests.Session
+    """
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+        allowed_methods=("GET", "POST"),
+        raise_on_status=False
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    return session
 
 
 class PolymarketClient:
@@ -146,38 +174,72 @@ class PolymarketClient:
                 print(f"✗ Failed to fetch orderbook for {token_id}: {response.status_code}")
                 return None
             
-            data = response.json()
-            
-            # Parse bids and asks
-            bids = []
-            asks = []
+            return self._parse_orderbook(token_id, response.json())
             
-            for bid in data.get('bids', []):
-                price = float(bid.get('price', 0))
-                size = float(bid.get('size', 0))
-                if price > 0 and size > 0:
-                    bids.append((price, size))
+        except Exception as e:
+            print(f"✗ Error fetching orderbook for {token_id}: {e}")
+            return None
+    
+    def get_orderbooks(self, token_ids):
+        """Get full orderbooks for several tokens in one POST /books round trip
+        
+        Args:
+            token_ids: CLOB token IDs for the outcomes
+        
+        Returns:
+            dict: token_id -> orderbook in the get_orderbook() shape (empty on failure)
+        """
+        try:
+            response = self.session.post(
+                f"{self.clob_api_base}/books",
+                json=[{'token_id': token_id} for token_id in token_ids],
+                timeout=10
+            )
             
-            for ask in data.get('asks', []):
-                price = float(ask.get('price', 0))
-                size = float(ask.get('size', 0))
-                if price > 0 and size > 0:
-                    asks.append((price, size))
+            if response.status_code != 200:
+                print(f"✗ Failed to fetch orderbooks: {response.status_code}")
+                return {}
             
-            # Sort: bids descending (best first), asks ascending (best first)
-            bids.sort(reverse=True, key=lambda x: x[0])
-            asks.sort(key=lambda x: x[0])
+            # Books come back in request order; asset_id confirms which token each one is
+            orderbooks = {}
+            for token_id, data in zip(token_ids, response.json()):
+                token_id = data.get('asset_id', token_id)
+                orderbooks[token_id] = self._parse_orderbook(token_id, data)
             
-            return {
-                'token_id': token_id,
-                'bids': bids,
-                'asks': asks,
-                'timestamp': datetime.utcnow().isoformat()
-            }
+            return orderbooks
             
         except Exception as e:
-            print(f"✗ Error fetching orderbook for {token_id}: {e}")
-            return None
+            print(f"✗ Error fetching orderbooks: {e}")
+            return {}
+    
+    def _parse_orderbook(self, token_id, data):
+        """Convert a raw CLOB book into the get_orderbook() shape"""
+        # Parse bids and asks
+        bids = []
+        asks = []
+        
+        for bid in data.get('bids', []):
+            price = float(bid.get('price', 0))
+            size = float(bid.get('size', 0))
+            if price > 0 and size > 0:
+                bids.append((price, size))
+        
+        for ask in data.get('asks', []):
+            price = float(ask.get('price', 0))
+            size = float(ask.get('size', 0))
+            if price > 0 and size > 0:
+                asks.append((price, size))
+        
+        # Sort: bids descending (best first), asks ascending (best first)
+        bids.sort(reverse=True, key=lambda x: x[0])
+        asks.sort(key=lambda x: x[0])
+        
+        return {
+            'token_id': token_id,
+            'bids': bids,
+            'asks': asks,
+            'timestamp': datetime.utcnow().isoformat()
+        }
     
     def calculate_vwap(self, orders, target_size):
         """Calculate volume-weighted average price for a target size
@@ -214,6 +276,53 @@ class PolymarketClient:
         
         return vwap, total_filled, remaining, slippage_pct
     
+    def calculate_vwap_vector(self, orders, target_sizes):
+        """Calculate VWAP for several target sizes in one pass over the book
+        
+        Cumulative size and cost are built once; each target size is then
+        located with a binary search instead of walking the book again.
+        
+        Args:
+            orders: List of (price, size) tuples from orderbook
+            target_sizes: List of contract counts to fill
+        
+        Returns:
+            list: (vwap, total_filled, remaining, slippage_pct) per target size,
+                  matching calculate_vwap()
+        """
+        cum_sizes = list(accumulate(size for _, size in orders))
+        cum_costs = list(accumulate(price * size for price, size in orders))
+        best_price = orders[0][0] if orders else 0
+        
+        results = []
+        for target_size in target_sizes:
+            if not orders or target_size <= 0:
+                results.append((None, 0, target_size, 0))
+                continue
+            
+            # First level whose cumulative size reaches the target gets the partial fill
+            level = bisect_left(cum_sizes, target_size)
+            total_filled = cum_sizes[level - 1] if level else 0
+            total_cost = cum_costs[level - 1] if level else 0
+            
+            if level < len(orders):
+                price, size = orders[level]
+                fill_size = min(size, target_size - total_filled)
+                total_cost += price * fill_size
+                total_filled += fill_size
+            
+            if total_filled == 0:
+                results.append((None, 0, target_size, 0))
+                continue
+            
+            vwap = total_cost / total_filled
+            remaining = target_size - total_filled
+            slippage_pct = ((vwap - best_price) / best_price) * 100 if best_price > 0 else 0
+            
+            results.append((vwap, total_filled, remaining, slippage_pct))
+        
+        return results
+    
     def get_market_by_slug(self, slug):
         """
         DEPRECATED: Get market data using event slug
@@ -6,14 +6,26 @@ Continuously monitors for arbitrage opportunities >= 1%
 Displays opportunities as they appear and tracks duration
 """
 
+import io
+import os
+import selectors
+import shutil
 import sqlite3
+import sys
+import termios
 import time
+import tty
+import unicodedata
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
+from itertools import islice
 
 DB_PATH = "data/market_data.db"
 MIN_PROFIT_THRESHOLD = 0.01  # 1%
 CHECK_INTERVAL = 0.5  # Check every 0.5 seconds
+UPDATE_POLL_INTERVAL = 0.1  # How often to check the DB for new commits
+GAMES_REFRESH_INTERVAL = 60  # tracked_markets only changes when refresh_markets.py runs
+MAX_CLOSED_HISTORY = 1000  # Closed opportunities kept in memory
 
 # NFL Team name mapping (City -> Team Name)
 NFL_TEAM_MAP = {
@@ -49,54 +61,178 @@ NFL_TEAM_MAP = {
     'Washington': 'Commanders'
 }
 
+# Reverse lookup: lowercased team name -> city
+NFL_TEAM_LOOKUP = {team.lower(): city for city, team in NFL_TEAM_MAP.items()}
+
 # Track active opportunities
 active_opportunities = {}
 opportunity_counter = 0
 
-def clear_screen():
-    """Clear terminal screen"""
-    print("\033[2J\033[H", end="")
+# NFL games ({event_id: description}), reloaded every GAMES_REFRESH_INTERVAL
+_games_cache = {'ts': 0.0, 'games': {}}
 
-def get_latest_prices(conn):
-    """Get latest prices for all NFL games"""
-    cursor = conn.cursor()
-    
-    # Get all NFL games
-    cursor.execute("""
-        SELECT DISTINCT event_id, description 
-        FROM tracked_markets 
-        WHERE sport = 'NFL'
-    """)
-    games = cursor.fetchall()
-    
-    game_data = {}
-    
-    for game in games:
-        event_id = game['event_id']
-        description = game['description']
-        
-        # Get latest Kalshi prices
-        cursor.execute("""
-            SELECT market_side, yes_ask, no_ask, timestamp
-            FROM price_snapshots
-            WHERE event_id = ? AND platform = 'kalshi'
+# Kalshi market_side -> lowercased team name used for Polymarket matching
+_kalshi_team_cache = {}
+
+# Polymarket market_side -> lowercased team name (None if not a known NFL team)
+_poly_team_cache = {}
+
+# Last scan per game: {event_id: (price signature, [opportunities])}
+_scan_cache = {}
+
+# Terminal size the last frame was drawn for (a change forces a full redraw)
+_last_terminal_size = None
+
+GAMES_QUERY = """
+    SELECT DISTINCT event_id, description 
+    FROM tracked_markets 
+    WHERE sport = 'NFL'
+"""
+
+# Latest Kalshi row + latest two Polymarket rows for every NFL game, in a
+# single statement. Each correlated subquery is an index range scan on
+# price_snapshots(event_id, platform), so no per-game round-trips are needed.
+#
+# Games that cannot clear the profit threshold never leave SQLite: every
+# combo costs at least the cheaper Kalshi ask plus the cheaper Polymarket
+# price, so if even that bound is short of the threshold the game is dropped.
+LATEST_PRICES_QUERY = """
+    WITH latest AS (
+        SELECT tm.id AS game_row, tm.event_id, ps.id AS snapshot_id, ps.platform,
+               ps.market_side, ps.yes_ask, ps.no_ask, ps.yes_price, ps.timestamp
+        FROM tracked_markets tm
+        JOIN price_snapshots ps ON ps.id IN (
+            SELECT id FROM price_snapshots
+            WHERE event_id = tm.event_id AND platform = 'kalshi'
             ORDER BY id DESC
             LIMIT 1
-        """, (event_id,))
-        
-        kalshi = cursor.fetchone()
-        
-        # Get latest Polymarket prices (both teams)
-        cursor.execute("""
-            SELECT market_side, yes_price, timestamp
-            FROM price_snapshots
-            WHERE event_id = ? AND platform = 'polymarket'
+        )
+        WHERE tm.sport = 'NFL'
+        UNION ALL
+        SELECT tm.id AS game_row, tm.event_id, ps.id AS snapshot_id, ps.platform,
+               ps.market_side, ps.yes_ask, ps.no_ask, ps.yes_price, ps.timestamp
+        FROM tracked_markets tm
+        JOIN price_snapshots ps ON ps.id IN (
+            SELECT id FROM price_snapshots
+            WHERE event_id = tm.event_id AND platform = 'polymarket'
             ORDER BY id DESC
             LIMIT 2
-        """, (event_id,))
+        )
+        WHERE tm.sport = 'NFL'
+    )
+    SELECT * FROM latest
+    WHERE event_id IN (
+        SELECT event_id FROM latest
+        GROUP BY event_id
+        HAVING 1.0 - (
+            MIN(CASE WHEN platform = 'kalshi' THEN MIN(yes_ask, no_ask) END)
+            + MIN(CASE WHEN platform = 'polymarket' THEN yes_price END)
+        ) >= ?
+    )
+    ORDER BY game_row, snapshot_id DESC
+"""
+
+def prepare_connection(conn):
+    """Tune the monitor's read-only connection
+    
+    Journal mode and indexes belong to the logger (db_setup.create_tables);
+    a reader only sets its own cache and temp-storage pragmas.
+    """
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    conn.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+
+def get_data_version(conn):
+    """Get SQLite's data_version counter for this connection
+    
+    The value changes whenever another connection (the data logger) commits
+    to the database, so comparing it is a near-free "any new prices?" check.
+    """
+    return conn.execute("PRAGMA data_version").fetchone()[0]
+
+def wait_for_update(conn, last_version, timeout, selector=None):
+    """Wait up to `timeout` seconds for the logger to commit new data
+    
+    Polls data_version every UPDATE_POLL_INTERVAL, so a burst of inserts
+    coalesces into a single wake-up. If a selector watching stdin is given,
+    a keypress ends the wait immediately.
+    
+    Returns:
+        (data_version, key) - data_version equals last_version if nothing
+        changed; key is the pressed key, or None
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        version = get_data_version(conn)
+        remaining = deadline - time.monotonic()
+        if version != last_version or remaining <= 0:
+            return version, None
         
-        poly_teams = cursor.fetchall()
+        wait = min(UPDATE_POLL_INTERVAL, remaining)
+        if selector is None:
+            time.sleep(wait)
+        elif selector.select(wait):
+            # os.read, not sys.stdin.read: a buffered read could swallow
+            # keys the selector would then never report
+            key = os.read(sys.stdin.fileno(), 1).decode(errors='ignore')
+            return version, key
+
+def get_games(conn):
+    """Get NFL games as {event_id: description}, cached between refreshes"""
+    now = time.monotonic()
+    if now - _games_cache['ts'] > GAMES_REFRESH_INTERVAL:
+        rows = conn.execute(GAMES_QUERY).fetchall()
+        _games_cache['games'] = dict(rows)
+        _games_cache['ts'] = now
+    return _games_cache['games']
+
+def get_kalshi_team_name(kalshi_team):
+    """Resolve a Kalshi city name to its lowercased team name (memoized)"""
+    name = _kalshi_team_cache.get(kalshi_team)
+    if name is None:
+        name = NFL_TEAM_MAP.get(kalshi_team, kalshi_team).lower()
+        _kalshi_team_cache[kalshi_team] = name
+    return name
+
+def get_poly_team_name(poly_team):
+    """Resolve a Polymarket outcome to a lowercased NFL team name (memoized)
+    
+    Returns None when the outcome isn't an exact NFL_TEAM_MAP team name.
+    """
+    try:
+        return _poly_team_cache[poly_team]
+    except KeyError:
+        token = poly_team.strip().lower()
+        name = token if token in NFL_TEAM_LOOKUP else None
+        _poly_team_cache[poly_team] = name
+        return name
+
+def get_latest_prices(conn):
+    """Get latest prices for all NFL games"""
+    games = get_games(conn)
+    rows = conn.execute(LATEST_PRICES_QUERY, (MIN_PROFIT_THRESHOLD,)).fetchall()
+    
+    # Bucket rows per game: {event_id: [description, kalshi, [poly_teams]]}
+    #   kalshi = (market_side, yes_ask, no_ask)
+    #   poly   = (market_side, yes_price)
+    buckets = {}
+    for _, event_id, _, platform, market_side, yes_ask, no_ask, yes_price, _ in rows:
+        bucket = buckets.get(event_id)
+        if bucket is None:
+            description = games.get(event_id)
+            if description is None:
+                # Added since the last games refresh - picked up next refresh
+                continue
+            bucket = buckets[event_id] = [description, None, []]
         
+        if platform == 'kalshi':
+            bucket[1] = (market_side, yes_ask, no_ask)
+        else:
+            bucket[2].append((market_side, yes_price))
+    
+    game_data = {}
+    
+    for event_id, (description, kalshi, poly_teams) in buckets.items():
         if kalshi and len(poly_teams) == 2:
             game_data[event_id] = {
                 'description': description,
@@ -107,30 +243,58 @@ def get_latest_prices(conn):
     return game_data
 
 def find_arbitrage_opportunities(game_data):
-    """Find arbitrage opportunities in current prices"""
-    opportunities = []
+    """Find arbitrage opportunities in current prices
+    
+    Games whose prices are unchanged since the previous scan reuse that
+    scan's result; only games with new prices are matched and priced.
+    """
+    now = datetime.now()  # One timestamp for the whole scan
+    
+    # {event_id: [opportunities]} in game order
+    event_opps = {}
+    price_sigs = {}
+    
+    # Pass 1: match teams and lay the prices out as parallel columns
+    matched = []  # (event_id, description, kalshi_team, poly_same, poly_opposite)
+    kalshi_yes_asks = []
+    kalshi_no_asks = []
+    poly_same_prices = []
+    poly_opposite_prices = []
     
     for event_id, data in game_data.items():
         kalshi = data['kalshi']
         poly_teams = data['polymarket']
-        description = data['description']
         
-        kalshi_team = kalshi['market_side']
-        kalshi_yes_ask = kalshi['yes_ask']
-        kalshi_no_ask = kalshi['no_ask']
+        kalshi_team, kalshi_yes_ask, kalshi_no_ask = kalshi
+        
+        sig = (kalshi_team, kalshi_yes_ask, kalshi_no_ask, tuple(poly_teams))
+        price_sigs[event_id] = sig
+        cached = _scan_cache.get(event_id)
+        if cached is not None and cached[0] == sig:
+            event_opps[event_id] = cached[1]
+            continue
+        event_opps[event_id] = []
         
         # Convert Kalshi city name to team name
-        kalshi_team_name = NFL_TEAM_MAP.get(kalshi_team, kalshi_team)
+        kalshi_team_name = get_kalshi_team_name(kalshi_team)
         
         # Match Polymarket teams to Kalshi using team name mapping
         poly_same_team = None
         poly_opposite_team = None
         
         for p in poly_teams:
-            poly_team_name = p['market_side']
+            poly_team_name = p[0]
+            
+            # Check if this Polymarket team matches the Kalshi team: exact
+            # lookup for known team names, substring match for anything else
+            poly_team_lower = get_poly_team_name(poly_team_name)
+            if poly_team_lower is not None:
+                is_same_team = poly_team_lower == kalshi_team_name
+            else:
+                poly_team_lower = poly_team_name.lower()
+                is_same_team = kalshi_team_name in poly_team_lower or poly_team_lower in kalshi_team_name
             
-            # Check if this Polymarket team matches the Kalshi team
-            if kalshi_team_name.lower() in poly_team_name.lower() or poly_team_name.lower() in kalshi_team_name.lower():
+            if is_same_team:
                 poly_same_team = p
             else:
                 poly_opposite_team = p
@@ -138,92 +302,193 @@ def find_arbitrage_opportunities(game_data):
         if not poly_same_team or not poly_opposite_team:
             continue
         
-        # Calculate both-outcome arbitrage opportunities
-        
-        # Combo 1: Kalshi YES + Polymarket opposite team
-        combo1_total = kalshi_yes_ask + poly_opposite_team['yes_price']
+        matched.append((event_id, data['description'], kalshi_team, poly_same_team, poly_opposite_team))
+        kalshi_yes_asks.append(kalshi_yes_ask)
+        kalshi_no_asks.append(kalshi_no_ask)
+        poly_same_prices.append(poly_same_team[1])
+        poly_opposite_prices.append(poly_opposite_team[1])
+    
+    # Pass 2: pure arithmetic over the columns
+    # Combo 1: Kalshi YES + Polymarket opposite team
+    # Combo 2: Kalshi NO + Polymarket same team
+    combo1_totals = [k + p for k, p in zip(kalshi_yes_asks, poly_opposite_prices)]
+    combo2_totals = [k + p for k, p in zip(kalshi_no_asks, poly_same_prices)]
+    
+    # Only games with at least one profitable combo allocate opportunity dicts
+    for i, (combo1_total, combo2_total) in enumerate(zip(combo1_totals, combo2_totals)):
         combo1_profit = 1.0 - combo1_total
+        combo2_profit = 1.0 - combo2_total
+        if combo1_profit < MIN_PROFIT_THRESHOLD and combo2_profit < MIN_PROFIT_THRESHOLD:
+            continue
+        
+        event_id, description, kalshi_team, poly_same_team, poly_opposite_team = matched[i]
+        
+        opportunities = event_opps[event_id]
         
         if combo1_profit >= MIN_PROFIT_THRESHOLD:
             opportunities.append({
                 'event_id': event_id,
                 'game': description,
-                'strategy': f"Kalshi YES ({kalshi_team}) + Poly {poly_opposite_team['market_side']}",
+                'strategy': f"Kalshi YES ({kalshi_team}) + Poly {poly_opposite_team[0]}",
                 'kalshi_side': f"YES {kalshi_team}",
-                'kalshi_price': kalshi_yes_ask,
-                'poly_side': poly_opposite_team['market_side'],
-                'poly_price': poly_opposite_team['yes_price'],
+                'kalshi_price': kalshi_yes_asks[i],
+                'poly_side': poly_opposite_team[0],
+                'poly_price': poly_opposite_prices[i],
                 'total_cost': combo1_total,
                 'profit_pct': combo1_profit * 100,
-                'timestamp': datetime.now()
+                'timestamp': now
             })
         
-        # Combo 2: Kalshi NO + Polymarket same team
-        combo2_total = kalshi_no_ask + poly_same_team['yes_price']
-        combo2_profit = 1.0 - combo2_total
-        
         if combo2_profit >= MIN_PROFIT_THRESHOLD:
             opportunities.append({
                 'event_id': event_id,
                 'game': description,
-                'strategy': f"Kalshi NO ({kalshi_team}) + Poly {poly_same_team['market_side']}",
+                'strategy': f"Kalshi NO ({kalshi_team}) + Poly {poly_same_team[0]}",
                 'kalshi_side': f"NO {kalshi_team}",
-                'kalshi_price': kalshi_no_ask,
-                'poly_side': poly_same_team['market_side'],
-                'poly_price': poly_same_team['yes_price'],
+                'kalshi_price': kalshi_no_asks[i],
+                'poly_side': poly_same_team[0],
+                'poly_price': poly_same_prices[i],
                 'total_cost': combo2_total,
                 'profit_pct': combo2_profit * 100,
-                'timestamp': datetime.now()
+                'timestamp': now
             })
     
-    return opportunities
+    # Remember this scan (games that dropped out of game_data are forgotten)
+    _scan_cache.clear()
+    for event_id, sig in price_sigs.items():
+        _scan_cache[event_id] = (sig, event_opps[event_id])
+    
+    return [opp for opps in event_opps.values() for opp in opps]
+
+def format_static_lines(opp):
+    """Format the lines of an opportunity block that never change while it is open"""
+    return "\n".join([
+        f"\n#{opp['id']} - {opp['game']}",
+        f"   Strategy: {opp['strategy']}",
+        f"   Kalshi:  {opp['kalshi_side']:20s} @ {opp['kalshi_price']:.3f}",
+        f"   Poly:    {opp['poly_side']:20s} @ {opp['poly_price']:.3f}",
+        f"   Total:   {opp['total_cost']:.4f} → Profit: {opp['profit_pct']:.2f}%",
+    ])
 
-def display_header():
+def display_header(out):
     """Display monitor header"""
-    print("=" * 100)
-    print("🔥 REAL-TIME NFL ARBITRAGE MONITOR")
-    print("=" * 100)
-    print(f"Monitoring for opportunities >= {MIN_PROFIT_THRESHOLD*100:.1f}%")
-    print(f"Current time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 100)
+    print("=" * 100, file=out)
+    print("🔥 REAL-TIME NFL ARBITRAGE MONITOR", file=out)
+    print("=" * 100, file=out)
+    print(f"Monitoring for opportunities >= {MIN_PROFIT_THRESHOLD*100:.1f}%", file=out)
+    print(f"Current time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", file=out)
+    print("=" * 100, file=out)
 
-def display_active_opportunities(active_opps):
+def display_active_opportunities(active_opps, out):
     """Display currently active opportunities"""
     if active_opps:
-        print("\n🚨 ACTIVE OPPORTUNITIES:")
-        print("-" * 100)
+        print("\n🚨 ACTIVE OPPORTUNITIES:", file=out)
+        print("-" * 100, file=out)
+        now = datetime.now()
         for key, opp in active_opps.items():
-            duration = (datetime.now() - opp['start_time']).total_seconds()
-            print(f"\n#{opp['id']} - {opp['game']}")
-            print(f"   Strategy: {opp['strategy']}")
-            print(f"   Kalshi:  {opp['kalshi_side']:20s} @ {opp['kalshi_price']:.3f}")
-            print(f"   Poly:    {opp['poly_side']:20s} @ {opp['poly_price']:.3f}")
-            print(f"   Total:   {opp['total_cost']:.4f} → Profit: {opp['profit_pct']:.2f}%")
-            print(f"   Duration: {duration:.1f}s (started {opp['start_time'].strftime('%H:%M:%S')})")
+            duration = (now - opp['start_time']).total_seconds()
+            print(opp['_static_lines'], file=out)
+            print(f"   Duration: {duration:.1f}s (started {opp['_start_str']})", file=out)
     else:
-        print("\n⏳ No opportunities currently available")
+        print("\n⏳ No opportunities currently available", file=out)
 
-def display_closed_opportunities(closed_opps):
+def display_closed_opportunities(closed_opps, out):
     """Display recently closed opportunities"""
     if closed_opps:
-        print("\n📊 RECENTLY CLOSED OPPORTUNITIES (Last 10):")
-        print("-" * 100)
-        for opp in closed_opps[-10:]:
-            print(f"\n#{opp['id']} - {opp['game']}")
-            print(f"   Strategy: {opp['strategy']}")
-            print(f"   Kalshi:  {opp['kalshi_side']:20s} @ {opp['kalshi_price']:.3f}")
-            print(f"   Poly:    {opp['poly_side']:20s} @ {opp['poly_price']:.3f}")
-            print(f"   Total:   {opp['total_cost']:.4f} → Profit: {opp['profit_pct']:.2f}%")
-            print(f"   Duration: {opp['duration']:.1f}s ({opp['start_time'].strftime('%H:%M:%S')} - {opp['end_time'].strftime('%H:%M:%S')})")
+        print("\n📊 RECENTLY CLOSED OPPORTUNITIES (Last 10):", file=out)
+        print("-" * 100, file=out)
+        for opp in islice(closed_opps, max(0, len(closed_opps) - 10), None):
+            print(opp['_closed_lines'], file=out)
+
+def render_frame(closed_opps, closed_count, paused=False, interactive=False):
+    """Render the full monitor screen into a list of lines"""
+    out = io.StringIO()
+    display_header(out)
+    if paused:
+        print("⏸️  PAUSED - prices are not being rescanned (press p to resume)", file=out)
+    display_active_opportunities(active_opportunities, out)
+    display_closed_opportunities(closed_opps, out)
+    
+    print("\n" + "=" * 100, file=out)
+    print(f"Total opportunities detected: {opportunity_counter}", file=out)
+    print(f"Currently active: {len(active_opportunities)}", file=out)
+    print(f"Closed: {closed_count}", file=out)
+    if interactive:
+        print("\nPress q to quit, p to pause/resume (or Ctrl+C to stop)", file=out)
+    else:
+        print("\nPress Ctrl+C to stop monitoring", file=out)
+    print("=" * 100, file=out)
+    return out.getvalue().split("\n")
+
+def display_width(line):
+    """Terminal columns a line occupies (emoji and other wide characters take two)"""
+    return sum(2 if unicodedata.east_asian_width(ch) in ('W', 'F') else 1 for ch in line)
+
+def draw_frame(lines, previous):
+    """Write only the screen rows that changed since the previous frame
+    
+    Args:
+        lines: Rendered lines for this frame
+        previous: Lines drawn last tick (None forces a full redraw)
+    
+    Returns:
+        The lines now on screen, to pass back in on the next tick
+        (None when the next frame must be redrawn in full)
+    """
+    global _last_terminal_size
+    
+    if not sys.stdout.isatty():
+        # Redirected output: no cursor control, just append the frame
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+        return lines
+    
+    size = shutil.get_terminal_size()
+    if len(lines) >= size.lines or any(display_width(line) > size.columns for line in lines):
+        # Frame doesn't fit: absolute row positioning would pile the overflow onto
+        # the last row, so clear and print it and let the terminal scroll
+        sys.stdout.write("\033[2J\033[H" + "\n".join(lines) + "\n")
+        sys.stdout.flush()
+        _last_terminal_size = size
+        return None
+    
+    if size != _last_terminal_size:
+        # Resized since the last frame: the old rows may have wrapped or scrolled
+        previous = None
+        _last_terminal_size = size
+    
+    chunks = []
+    if previous is None:
+        chunks.append("\033[2J")
+        previous = []
+    
+    for row, line in enumerate(lines):
+        if row >= len(previous) or previous[row] != line:
+            chunks.append(f"\033[{row + 1};1H{line}\033[K")
+    
+    if len(lines) < len(previous):
+        # Frame got shorter - erase everything below it
+        chunks.append(f"\033[{len(lines) + 1};1H\033[J")
+    
+    sys.stdout.write("".join(chunks))
+    sys.stdout.flush()
+    return lines
 
 def main():
     """Main monitoring loop"""
     global opportunity_counter
     
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    # One connection for the whole run: the monitor's SQL strings are module
+    # constants, so sqlite3's per-connection statement cache compiles each
+    # query once and reuses the prepared statement on every tick.
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    prepare_connection(conn)
     
-    closed_opportunities = []
+    # Recent history only; summary stats are accumulated as opportunities close
+    closed_opportunities = deque(maxlen=MAX_CLOSED_HISTORY)
+    closed_count = 0
+    closed_total_duration = 0.0
+    closed_max_profit = None
     
     print("\n🚀 Starting real-time arbitrage monitor...")
     print(f"   Minimum profit threshold: {MIN_PROFIT_THRESHOLD*100:.1f}%")
@@ -231,13 +496,32 @@ def main():
     print("\n")
     time.sleep(2)
     
+    screen = None  # Lines currently on the terminal
+    current_opps = []
+    scanned_version = None  # data_version the current scan was computed from
+    data_version = get_data_version(conn)
+    paused = False
+    
+    # Single-key commands: cbreak mode delivers keys without Enter, and the
+    # selector lets a keypress interrupt the wait between ticks
+    selector = None
+    saved_tty = None
+    if sys.stdin.isatty():
+        saved_tty = termios.tcgetattr(sys.stdin.fileno())
+        tty.setcbreak(sys.stdin.fileno())
+        selector = selectors.DefaultSelector()
+        selector.register(sys.stdin, selectors.EVENT_READ)
+    
     try:
         while True:
-            # Get latest prices
-            game_data = get_latest_prices(conn)
-            
-            # Find current opportunities
-            current_opps = find_arbitrage_opportunities(game_data)
+            # Only re-query and re-scan when the logger committed new data
+            if data_version != scanned_version and not paused:
+                # Get latest prices
+                game_data = get_latest_prices(conn)
+                
+                # Find current opportunities
+                current_opps = find_arbitrage_opportunities(game_data)
+                scanned_version = data_version
             
             # Create keys for current opportunities
             current_keys = set()
@@ -248,11 +532,15 @@ def main():
                 # If this is a new opportunity, add it to active
                 if key not in active_opportunities:
                     opportunity_counter += 1
-                    active_opportunities[key] = {
+                    new_opp = {
                         'id': opportunity_counter,
                         'start_time': opp['timestamp'],
                         **opp
                     }
+                    # Only the duration changes per tick - format the rest once
+                    new_opp['_static_lines'] = format_static_lines(new_opp)
+                    new_opp['_start_str'] = new_opp['start_time'].strftime('%H:%M:%S')
+                    active_opportunities[key] = new_opp
             
             # Check for closed opportunities
             closed_keys = set(active_opportunities.keys()) - current_keys
@@ -260,24 +548,33 @@ def main():
                 opp = active_opportunities.pop(key)
                 opp['end_time'] = datetime.now()
                 opp['duration'] = (opp['end_time'] - opp['start_time']).total_seconds()
+                opp['_closed_lines'] = (
+                    f"{opp['_static_lines']}\n"
+                    f"   Duration: {opp['duration']:.1f}s ({opp['_start_str']} - {opp['end_time'].strftime('%H:%M:%S')})"
+                )
                 closed_opportunities.append(opp)
+                
+                closed_count += 1
+                closed_total_duration += opp['duration']
+                if closed_max_profit is None or opp['profit_pct'] > closed_max_profit:
+                    closed_max_profit = opp['profit_pct']
             
-            # Display current state
-            clear_screen()
-            display_header()
-            display_active_opportunities(active_opportunities)
-            display_closed_opportunities(closed_opportunities)
-            
-            print("\n" + "=" * 100)
-            print(f"Total opportunities detected: {opportunity_counter}")
-            print(f"Currently active: {len(active_opportunities)}")
-            print(f"Closed: {len(closed_opportunities)}")
-            print("\nPress Ctrl+C to stop monitoring")
-            print("=" * 100)
+            # Display current state (only rows that changed are rewritten)
+            screen = draw_frame(
+                render_frame(closed_opportunities, closed_count, paused, selector is not None),
+                screen
+            )
             
-            time.sleep(CHECK_INTERVAL)
+            data_version, key = wait_for_update(conn, data_version, CHECK_INTERVAL, selector)
+            if key == 'q':
+                raise KeyboardInterrupt
+            if key == 'p':
+                paused = not paused
     
     except KeyboardInterrupt:
+        if screen and sys.stdout.isatty():
+            # Park the cursor below the last frame before printing the summary
+            sys.stdout.write(f"\033[{len(screen)};1H")
         print("\n\n🛑 Monitoring stopped by user")
         
         # Display final summary
@@ -286,19 +583,21 @@ def main():
         print("=" * 100)
         print(f"Total opportunities detected: {opportunity_counter}")
         print(f"Active at shutdown: {len(active_opportunities)}")
-        print(f"Closed: {len(closed_opportunities)}")
+        print(f"Closed: {closed_count}")
         
-        if closed_opportunities:
-            total_duration = sum(opp['duration'] for opp in closed_opportunities)
-            avg_duration = total_duration / len(closed_opportunities)
-            max_profit = max(opp['profit_pct'] for opp in closed_opportunities)
+        if closed_count:
+            avg_duration = closed_total_duration / closed_count
             
             print(f"\nAverage opportunity duration: {avg_duration:.1f}s")
-            print(f"Maximum profit seen: {max_profit:.2f}%")
+            print(f"Maximum profit seen: {closed_max_profit:.2f}%")
         
         print("=" * 100)
     
     finally:
+        if saved_tty is not None:
+            termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, saved_tty)
+        if selector is not None:
+            selector.close()
         conn.close()
 
 if __name__ == "__main__":
@@ -5,8 +5,14 @@ Automatically updates config/markets.json with current games
 """
 
 import json
+import os
+import re
+import shutil
 import sys
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from kalshi_client import KalshiClient
 from polymarket_client import PolymarketClient
 
@@ -39,6 +45,26 @@ NBA_TEAM_MAP = {
     'Toronto': 'Raptors', 'Utah': 'Jazz', 'Washington': 'Wizards'
 }
 
+# Game date at the end of a Polymarket slug, e.g. nfl-ari-la-2026-01-04
+SLUG_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:$|[^\d])')
+
+def configure_discovery_session(session):
+    """Pool keep-alive connections and retry transient errors on a session
+    
+    Discovery runs its requests concurrently against the same hosts, so the
+    pool is sized for that; 429/5xx responses are retried with backoff
+    instead of silently returning no games. (urllib3 already sets
+    TCP_NODELAY, and requests sends gzip/keep-alive headers by default.)
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET']
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+    session.mount('https://', adapter)
+
 def discover_kalshi_markets(kalshi, series_prefix='KXNFLGAME'):
     """Discover open Kalshi markets"""
     print(f"\n🔍 Searching Kalshi for {series_prefix} markets...")
@@ -87,15 +113,15 @@ def discover_kalshi_markets(kalshi, series_prefix='KXNFLGAME'):
         print(f"   ✗ Error: {e}")
         return []
 
-def discover_polymarket_nfl(polymarket):
-    """Discover Polymarket NFL games"""
-    print(f"\n🔍 Searching Polymarket for NFL games...")
+def discover_polymarket_by_tag(polymarket, tag_id, sport):
+    """Discover upcoming Polymarket games (next 7 days) for a sport tag"""
+    print(f"\n🔍 Searching Polymarket for {sport} games...")
     
     try:
         response = polymarket.session.get(
             f"{polymarket.gamma_api_base}/events",
             params={
-                'tag_id': '450',  # NFL tag
+                'tag_id': tag_id,
                 'closed': 'false',
                 'limit': 100
             },
@@ -111,18 +137,18 @@ def discover_polymarket_nfl(polymarket):
             
             upcoming = []
             for event in events:
-                slug = event.get('slug', '')
                 # Extract date from slug (format: nfl-xxx-yyy-2026-01-05)
-                if '2026-' in slug:
-                    try:
-                        date_str = slug.split('2026-')[1].split('-')[:2]
-                        date_str = f"2026-{date_str[0]}-{date_str[1]}"
-                        event_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                        
-                        if today <= event_date <= week_from_now:
-                            upcoming.append(event)
-                    except:
-                        pass
+                match = SLUG_DATE_RE.search(event.get('slug', ''))
+                if not match:
+                    continue
+                
+                try:
+                    event_date = date(int(match[1]), int(match[2]), int(match[3]))
+                except ValueError:
+                    continue
+                
+                if today <= event_date <= week_from_now:
+                    upcoming.append(event)
             
             print(f"   ✓ Found {len(upcoming)} upcoming games")
             return upcoming
@@ -133,50 +159,13 @@ def discover_polymarket_nfl(polymarket):
         print(f"   ✗ Error: {e}")
         return []
 
+def discover_polymarket_nfl(polymarket):
+    """Discover Polymarket NFL games"""
+    return discover_polymarket_by_tag(polymarket, '450', 'NFL')  # NFL tag
+
 def discover_polymarket_nba(polymarket):
     """Discover Polymarket NBA games"""
-    print(f"\n🔍 Searching Polymarket for NBA games...")
-    
-    try:
-        response = polymarket.session.get(
-            f"{polymarket.gamma_api_base}/events",
-            params={
-                'tag_id': '370',  # NBA tag
-                'closed': 'false',
-                'limit': 100
-            },
-            timeout=10
-        )
-        
-        if response.status_code == 200:
-            events = response.json()
-            
-            # Filter for upcoming games
-            today = datetime.now().date()
-            week_from_now = today + timedelta(days=7)
-            
-            upcoming = []
-            for event in events:
-                slug = event.get('slug', '')
-                if '2026-' in slug:
-                    try:
-                        date_str = slug.split('2026-')[1].split('-')[:2]
-                        date_str = f"2026-{date_str[0]}-{date_str[1]}"
-                        event_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                        
-                        if today <= event_date <= week_from_now:
-                            upcoming.append(event)
-                    except:
-                        pass
-            
-            print(f"   ✓ Found {len(upcoming)} upcoming games")
-            return upcoming
-        
-        return []
-        
-    except Exception as e:
-        print(f"   ✗ Error: {e}")
-        return []
+    return discover_polymarket_by_tag(polymarket, '370', 'NBA')  # NBA tag
 
 def match_games(kalshi_games, poly_events, sport='NFL'):
     """Match Kalshi and Polymarket games"""
@@ -184,6 +173,11 @@ def match_games(kalshi_games, poly_events, sport='NFL'):
     
     matched = []
     
+    # Slugs/titles are lowercased once here rather than once per Kalshi game
+    for p_event in poly_events:
+        p_event['_slug_lc'] = p_event.get('slug', '').lower()
+        p_event['_title_lc'] = p_event.get('title', '').lower()
+    
     for k_game in kalshi_games:
         k_title = k_game['title'].lower()
         k_markets = k_game['markets']
@@ -191,18 +185,18 @@ def match_games(kalshi_games, poly_events, sport='NFL'):
         # Extract team info
         team_a_ticker = k_markets[0]['ticker'].split('-')[-1].lower()
         team_b_ticker = k_markets[1]['ticker'].split('-')[-1].lower()
+        team_a_name = k_markets[0].get('yes_sub_title', '').lower()
+        team_b_name = k_markets[1].get('yes_sub_title', '').lower()
         
-        # Try to match with Polymarket
+        # Try to match with Polymarket (every event, in order: the codes only
+        # need to be substrings of the slug, e.g. Kalshi 'LA' in 'lar')
         for p_event in poly_events:
-            p_slug = p_event.get('slug', '').lower()
+            p_slug = p_event['_slug_lc']
             
             # Check if both team codes appear in slug
             if team_a_ticker in p_slug or team_b_ticker in p_slug:
                 # Additional verification: check if both teams match
-                team_a_name = k_markets[0].get('yes_sub_title', '').lower()
-                team_b_name = k_markets[1].get('yes_sub_title', '').lower()
-                
-                p_title = p_event.get('title', '').lower()
+                p_title = p_event['_title_lc']
                 
                 # Simple matching: check if team names appear in Polymarket title
                 if any(word in p_title for word in team_a_name.split()) and \
@@ -285,27 +279,39 @@ def main():
         private_key_path=config['kalshi']['private_key_path']
     )
     polymarket = PolymarketClient()
+    configure_discovery_session(polymarket.session)
     
     all_markets = []
     
-    # Discover NFL games
+    # The four discovery calls are independent HTTP requests - run them
+    # concurrently so total latency is the slowest call, not the sum
+    # (requests.Session is safe to share across threads for separate requests)
+    print("\n🔍 Discovering NFL and NBA markets on both platforms...")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        f_kalshi_nfl = executor.submit(discover_kalshi_markets, kalshi, 'KXNFLGAME')
+        f_poly_nfl = executor.submit(discover_polymarket_nfl, polymarket)
+        f_kalshi_nba = executor.submit(discover_kalshi_markets, kalshi, 'KXNBAGAME')
+        f_poly_nba = executor.submit(discover_polymarket_nba, polymarket)
+    
+    kalshi_nfl = f_kalshi_nfl.result()
+    poly_nfl = f_poly_nfl.result()
+    kalshi_nba = f_kalshi_nba.result()
+    poly_nba = f_poly_nba.result()
+    
+    # Match NFL games
     print("\n" + "=" * 80)
     print("🏈 NFL MARKETS")
     print("=" * 80)
     
-    kalshi_nfl = discover_kalshi_markets(kalshi, 'KXNFLGAME')
-    poly_nfl = discover_polymarket_nfl(polymarket)
     matched_nfl = match_games(kalshi_nfl, poly_nfl, 'NFL')
     nfl_markets = generate_markets_config(matched_nfl, 'NFL')
     all_markets.extend(nfl_markets)
     
-    # Discover NBA games
+    # Match NBA games
     print("\n" + "=" * 80)
     print("🏀 NBA MARKETS")
     print("=" * 80)
     
-    kalshi_nba = discover_kalshi_markets(kalshi, 'KXNBAGAME')
-    poly_nba = discover_polymarket_nba(polymarket)
     matched_nba = match_games(kalshi_nba, poly_nba, 'NBA')
     nba_markets = generate_markets_config(matched_nba, 'NBA')
     all_markets.extend(nba_markets)
@@ -324,12 +330,9 @@ def main():
     else:
         # Backup old config
         try:
-            with open('config/markets.json', 'r') as f:
-                old_config = f.read()
-            with open('config/markets.json.backup', 'w') as f:
-                f.write(old_config)
+            shutil.copy2('config/markets.json', 'config/markets.json.backup')
             print("   ✓ Backed up old config to markets.json.backup")
-        except:
+        except OSError:
             pass
         
         # Write new config
@@ -340,8 +343,12 @@ def main():
             "markets": all_markets
         }
         
-        with open('config/markets.json', 'w') as f:
+        # Write to a temp file and swap it in, so a crash mid-write can never
+        # leave the logger/monitor with a truncated markets.json
+        tmp_path = 'config/markets.json.tmp'
+        with open(tmp_path, 'w') as f:
             json.dump(markets_config, f, indent=2)
+        os.replace(tmp_path, 'config/markets.json')
         
         print(f"\n✅ Created markets.json with {len(all_markets)} games")
         print(f"   NFL: {len(nfl_markets)}")
@@ -3,12 +3,26 @@
 Test Polymarket API to debug 422 errors
 """
 
-import requests
 import json
+from polymarket_client import create_probe_session
 
-print("=" * 70)
+# Output banners
+BAR70 = "=" * 70
+HBAR70 = "-" * 70
+
+# Use orjson for response parsing when it's installed
+try:
+    import orjson
+    loads_json = orjson.loads
+except ImportError:
+    loads_json = json.loads
+
+# One pooled, retrying session for every request below
+SESSION = create_probe_session()
+
+print(BAR70)
 print("TESTING POLYMARKET API")
-print("=" * 70)
+print(BAR70)
 print()
 
 # Test condition ID (Portland vs OKC)
@@ -19,10 +33,10 @@ print()
 
 # Step 1: Get market info from Gamma API
 print("STEP 1: Fetching market from Gamma API")
-print("-" * 70)
+print(HBAR70)
 
 try:
-    response = requests.get(
+    response = SESSION.get(
         f"https://gamma-api.polymarket.com/markets/{condition_id}",
         timeout=10
     )
@@ -30,7 +44,7 @@ try:
     print(f"Status Code: {response.status_code}")
     
     if response.status_code == 200:
-        market = response.json()
+        market = loads_json(response.content)
         print("✓ Successfully fetched market data")
         print()
         
@@ -46,7 +60,7 @@ try:
             # Parse if string
             if isinstance(token_ids, str):
                 print("  Token IDs is a string, parsing JSON...")
-                token_ids = json.loads(token_ids)
+                token_ids = loads_json(token_ids)
             
             print(f"  Token IDs: {token_ids}")
             print()
@@ -59,23 +73,26 @@ try:
                 print(f"  NO token:  {no_token}")
                 print()
                 
-                # Step 2: Test CLOB API
-                print("STEP 2: Fetching orderbook from CLOB API")
-                print("-" * 70)
+                # Step 2: Test CLOB API (both outcomes in one /books round trip)
+                print("STEP 2: Fetching orderbooks from CLOB API")
+                print(HBAR70)
                 
-                ob_response = requests.get(
-                    "https://clob.polymarket.com/book",
-                    params={'token_id': yes_token},
+                ob_response = SESSION.post(
+                    "https://clob.polymarket.com/books",
+                    json=[{'token_id': yes_token}, {'token_id': no_token}],
                     timeout=10
                 )
                 
                 print(f"Status Code: {ob_response.status_code}")
                 
                 if ob_response.status_code == 200:
-                    ob_data = ob_response.json()
-                    print("✓ Successfully fetched orderbook")
+                    books = loads_json(ob_response.content)
+                    print(f"✓ Successfully fetched {len(books)} orderbooks")
                     print()
                     
+                    # Pick the YES book by asset_id rather than trusting response order
+                    ob_data = next((book for book in books if book.get('asset_id') == yes_token), {})
+                    
                     bids = ob_data.get('bids', [])
                     asks = ob_data.get('asks', [])
                     
@@ -92,9 +109,9 @@ try:
                         print(f"  Best Ask: ${best_ask:.4f}")
                         print(f"  Mid Price: ${mid:.4f}")
                         print()
-                        print("=" * 70)
+                        print(BAR70)
                         print("✅ SUCCESS! Both APIs work correctly")
-                        print("=" * 70)
+                        print(BAR70)
                         print()
                         print("The polymarket_client.py code should work!")
                     else:
@@ -104,9 +121,9 @@ try:
                     print(f"✗ CLOB API failed")
                     print(f"Response: {ob_response.text[:200]}")
                     print()
-                    print("=" * 70)
+                    print(BAR70)
                     print("❌ FAILED at CLOB API step")
-                    print("=" * 70)
+                    print(BAR70)
             else:
                 print("✗ Token IDs is not a list or has < 2 items")
                 print(f"  Value: {token_ids}")
@@ -118,9 +135,9 @@ try:
                 print(f"  - {key}")
             
             print()
-            print("=" * 70)
+            print(BAR70)
             print("❌ FAILED - No token IDs in response")
-            print("=" * 70)
+            print(BAR70)
             print()
             print("Possible reasons:")
             print("  1. API response structure changed")
@@ -131,9 +148,9 @@ try:
         print("✗ Got 422 error from Gamma API")
         print(f"Response: {response.text[:200]}")
         print()
-        print("=" * 70)
+        print(BAR70)
         print("❌ FAILED - 422 Error")
-        print("=" * 70)
+        print(BAR70)
         print()
         print("Possible reasons:")
         print("  1. Condition ID format wrong")
@@ -148,9 +165,10 @@ except Exception as e:
     import traceback
     traceback.print_exc()
     print()
-    print("=" * 70)
+    print(BAR70)
     print("❌ EXCEPTION")
-    print("=" * 70)
+    print(BAR70)
 
 print()
 
+SESSION.close()
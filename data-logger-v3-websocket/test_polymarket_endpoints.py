@@ -3,11 +3,18 @@
 Test different Polymarket endpoints to find which one works
 """
 
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from polymarket_client import create_probe_session
 
-print("=" * 70)
+# Output banners
+BAR70 = "=" * 70
+
+# One pooled, retrying session for every request below
+SESSION = create_probe_session()
+
+print(BAR70)
 print("TESTING POLYMARKET ENDPOINTS")
-print("=" * 70)
+print(BAR70)
 print()
 
 # Portland vs OKC condition ID from our discovery
@@ -23,12 +30,25 @@ endpoints = [
     ("CLOB /markets", f"https://clob.polymarket.com/markets/{condition_id}"),
 ]
 
-for name, url in endpoints:
+def probe(endpoint):
+    """GET one endpoint; returns (name, url, response, error)"""
+    name, url = endpoint
+    try:
+        return name, url, SESSION.get(url, timeout=10), None
+    except Exception as e:
+        return name, url, None, e
+
+# The probes are independent - fire them all at once, then report in order
+with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+    results = list(executor.map(probe, endpoints))
+
+for name, url, response, error in results:
     print(f"Testing: {name}")
     print(f"  URL: {url}")
     
     try:
-        response = requests.get(url, timeout=10)
+        if error is not None:
+            raise error
         print(f"  Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -53,9 +73,9 @@ for name, url in endpoints:
     print()
 
 print()
-print("=" * 70)
+print(BAR70)
 print("Trying to fetch by slug instead...")
-print("=" * 70)
+print(BAR70)
 print()
 
 # The slug we know works (from discovery script)
@@ -67,7 +87,7 @@ url = f"https://gamma-api.polymarket.com/events/slug/{slug}"
 print(f"URL: {url}")
 
 try:
-    response = requests.get(url, timeout=10)
+    response = SESSION.get(url, timeout=10)
     print(f"Status: {response.status_code}")
     
     if response.status_code == 200:
@@ -106,9 +126,9 @@ try:
                     print(f"  Parsed: {token_ids}")
                 
                 print()
-                print("=" * 70)
+                print(BAR70)
                 print("✅ SOLUTION FOUND!")
-                print("=" * 70)
+                print(BAR70)
                 print()
                 print("We need to:")
                 print("1. Store event SLUG (not just condition ID)")
@@ -126,3 +146,4 @@ except Exception as e:
 
 print()
 
+SESSION.close()
@@ -9,13 +9,15 @@ Analyzes:
 4. Realistic trade execution scenarios
 """
 
+import heapq
 import sqlite3
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from collections import defaultdict
 
 DB_PATH = "data/market_data.db"
 EVENT_ID = "kxnflgame_26jan04cartb_car"
 MIN_PROFIT_THRESHOLD = 0.001  # 0.1% (to see all opportunities)
+FETCH_BATCH_SIZE = 10000  # Pivoted rows pulled from SQLite per fetchmany()
 
 # Kalshi fees
 KALSHI_MAKER_FEE = 0.00  # 0% maker fee
@@ -25,121 +27,169 @@ KALSHI_TAKER_FEE = 0.03  # 3% taker fee (conservative)
 POLYMARKET_FEE = 0.00  # 0% trading fee
 ON_CHAIN_COST = 0.002  # 0.2% for gas/on-chain friction
 
-print("=" * 100)
+# Output banners
+BAR100 = "=" * 100
+HBAR100 = "-" * 100
+
+# Per-window report block, filled in only when windows are printed
+WINDOW_TEMPLATE = (
+    "\n🎯 Window #{number}\n"
+    "   Strategy: {strategy}\n"
+    "   Start:    {start:%Y-%m-%d %H:%M:%S}\n"
+    "   End:      {end:%Y-%m-%d %H:%M:%S}\n"
+    "   Duration: {duration:.1f} seconds\n"
+    "   Snapshots: {snapshots}\n"
+    "   Net Profit Range: {min_net_profit:.2f}% - {max_net_profit:.2f}%\n"
+    "   Avg Kalshi Volume: ${avg_kalshi_volume:,.2f}\n"
+    "   Avg Poly Volume: ${avg_poly_volume:,.2f}"
+)
+
+
+@dataclass
+class Opportunity:
+    """A single timestamp where one strategy clears the profit threshold"""
+    # Declared by hand: @dataclass(slots=True) needs Python 3.10+
+    __slots__ = ('timestamp', 'timestamp_ms', 'strategy', 'kalshi_side', 'kalshi_price',
+                 'poly_side', 'poly_price', 'gross_profit', 'net_profit', 'kalshi_volume',
+                 'poly_volume')
+    timestamp: str
+    timestamp_ms: int  # Epoch milliseconds, for window gap checks
+    strategy: str
+    kalshi_side: str
+    kalshi_price: float
+    poly_side: str
+    poly_price: float
+    gross_profit: float  # Fraction of $1 payout; scaled to % only for output
+    net_profit: float
+    kalshi_volume: float
+    poly_volume: float
+
+
+print(BAR100)
 print("🏈 PANTHERS vs BUCCANEERS - ARBITRAGE TRADEABILITY ANALYSIS")
-print("=" * 100)
+print(BAR100)
 
-conn = sqlite3.connect(DB_PATH)
-conn.row_factory = sqlite3.Row
+# Pure reader: open read-only (no write locks) with a large page cache and mmap
+conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+conn.execute("PRAGMA cache_size=-200000")  # ~200 MB page cache
+conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+conn.execute("PRAGMA temp_store=MEMORY")
 
-# Get all snapshots for this game
+# Pivot snapshots into one row per timestamp so prices are synchronized.
+# idx_price_snapshots_event_time (created by the logger) returns them in GROUP BY order.
+# Timestamps come back ready for fromisoformat() and as epoch milliseconds for gap checks.
 cursor = conn.cursor()
 cursor.execute("""
     SELECT 
-        platform,
-        market_side,
-        yes_price,
-        yes_bid,
-        yes_ask,
-        no_bid,
-        no_ask,
-        volume,
-        timestamp,
-        id
+        REPLACE(timestamp, 'Z', '') AS iso_timestamp,
+        CAST(ROUND((julianday(timestamp) - 2440587.5) * 86400000) AS INTEGER) AS timestamp_ms,
+        MAX(CASE WHEN platform = 'kalshi' AND market_side = 'Carolina' THEN yes_ask END) AS kalshi_yes_ask,
+        MAX(CASE WHEN platform = 'kalshi' AND market_side = 'Carolina' THEN no_ask END) AS kalshi_no_ask,
+        MAX(CASE WHEN platform = 'kalshi' AND market_side = 'Carolina' THEN yes_bid END) AS kalshi_yes_bid,
+        MAX(CASE WHEN platform = 'kalshi' AND market_side = 'Carolina' THEN no_bid END) AS kalshi_no_bid,
+        MAX(CASE WHEN platform = 'kalshi' AND market_side = 'Carolina' THEN volume END) AS kalshi_volume,
+        MAX(CASE WHEN platform = 'polymarket' AND market_side = 'Panthers' THEN yes_price END) AS poly_panthers,
+        MAX(CASE WHEN platform = 'polymarket' AND market_side = 'Buccaneers' THEN yes_price END) AS poly_bucs,
+        MAX(CASE WHEN platform = 'polymarket' THEN volume END) AS poly_volume,
+        COUNT(*) AS snapshot_count
     FROM price_snapshots
     WHERE event_id = ?
+    GROUP BY timestamp
     ORDER BY timestamp ASC
 """, (EVENT_ID,))
 
-all_snapshots = cursor.fetchall()
+# Stream the pivoted rows in batches, keeping only timestamps with all 4 prices
+total_snapshots = 0
+timestamps = []
+timestamps_ms = []
+kalshi_yes_asks = []
+kalshi_no_asks = []
+poly_panthers = []
+poly_bucs = []
+kalshi_volumes = []
+poly_volumes = []
+
+# Rows are (timestamp, timestamp_ms, kalshi_yes_ask, kalshi_no_ask, kalshi_yes_bid, kalshi_no_bid,
+#            kalshi_volume, poly_panthers, poly_bucs, poly_volume, snapshot_count)
+cursor.arraysize = FETCH_BATCH_SIZE
+
+while True:
+    rows = cursor.fetchmany()
+    if not rows:
+        break
+    
+    total_snapshots += sum(row[10] for row in rows)
+    rows = [row for row in rows if None not in (row[2], row[3], row[7], row[8])]
+    
+    timestamps.extend(row[0] for row in rows)
+    timestamps_ms.extend(row[1] for row in rows)
+    kalshi_yes_asks.extend(row[2] for row in rows)
+    kalshi_no_asks.extend(row[3] for row in rows)
+    poly_panthers.extend(row[7] for row in rows)
+    poly_bucs.extend(row[8] for row in rows)
+    kalshi_volumes.extend(row[6] or 0 for row in rows)
+    poly_volumes.extend(row[9] or 0 for row in rows)
 
 print(f"\n📊 DATA SUMMARY:")
-print("-" * 100)
-print(f"Total snapshots: {len(all_snapshots):,}")
-
-# Group by timestamp to get synchronized price data
-price_data = defaultdict(dict)
-
-for snap in all_snapshots:
-    ts = snap['timestamp']
-    platform = snap['platform']
-    side = snap['market_side']
-    
-    if platform == 'kalshi':
-        if side == 'Carolina':
-            price_data[ts]['kalshi_yes_ask'] = snap['yes_ask']
-            price_data[ts]['kalshi_no_ask'] = snap['no_ask']
-            price_data[ts]['kalshi_yes_bid'] = snap['yes_bid']
-            price_data[ts]['kalshi_no_bid'] = snap['no_bid']
-            price_data[ts]['kalshi_volume'] = snap['volume']
-    elif platform == 'polymarket':
-        if side == 'Panthers':
-            price_data[ts]['poly_panthers'] = snap['yes_price']
-        elif side == 'Buccaneers':
-            price_data[ts]['poly_bucs'] = snap['yes_price']
-        
-        # Volume is the same for both teams (total market volume)
-        if 'poly_volume' not in price_data[ts]:
-            price_data[ts]['poly_volume'] = snap['volume']
+print(HBAR100)
+print(f"Total snapshots: {total_snapshots:,}")
 
 # Find arbitrage opportunities
 print(f"\n🔍 SCANNING FOR ARBITRAGE OPPORTUNITIES (>= {MIN_PROFIT_THRESHOLD*100:.1f}%)...")
-print("-" * 100)
+print(HBAR100)
+
+# Strategy 1: Buy Kalshi YES (Panthers) + Buy Poly Bucs
+# Strategy 2: Buy Kalshi NO (Bucs) + Buy Poly Panthers
+combo1_gross = [1.0 - (k + p) for k, p in zip(kalshi_yes_asks, poly_bucs)]
+combo2_gross = [1.0 - (k + p) for k, p in zip(kalshi_no_asks, poly_panthers)]
+
+# Only build records for timestamps where at least one strategy clears the threshold
+hits = [
+    i for i, (g1, g2) in enumerate(zip(combo1_gross, combo2_gross))
+    if g1 >= MIN_PROFIT_THRESHOLD or g2 >= MIN_PROFIT_THRESHOLD
+]
 
 opportunities = []
 
-for ts, prices in sorted(price_data.items()):
-    # Need all 4 prices for analysis
-    if all(k in prices for k in ['kalshi_yes_ask', 'kalshi_no_ask', 'poly_panthers', 'poly_bucs']):
-        
-        # Strategy 1: Buy Kalshi YES (Panthers) + Buy Poly Bucs
-        combo1_total = prices['kalshi_yes_ask'] + prices['poly_bucs']
-        combo1_gross_profit = 1.0 - combo1_total
-        
-        # Calculate net profit after fees (conservative: assume taker on both)
-        kalshi_cost = prices['kalshi_yes_ask']
-        poly_cost = prices['poly_bucs']
-        kalshi_fee = kalshi_cost * KALSHI_TAKER_FEE
-        poly_fee = poly_cost * ON_CHAIN_COST
-        combo1_net_profit = combo1_gross_profit - kalshi_fee - poly_fee
-        
-        if combo1_gross_profit >= MIN_PROFIT_THRESHOLD:
-            opportunities.append({
-                'timestamp': ts,
-                'strategy': 'Kalshi YES (Panthers) + Poly Bucs',
-                'kalshi_side': 'YES Panthers',
-                'kalshi_price': prices['kalshi_yes_ask'],
-                'poly_side': 'Buccaneers',
-                'poly_price': prices['poly_bucs'],
-                'gross_profit_pct': combo1_gross_profit * 100,
-                'net_profit_pct': combo1_net_profit * 100,
-                'kalshi_volume': prices.get('kalshi_volume', 0),
-                'poly_volume': prices.get('poly_volume', 0)
-            })
-        
-        # Strategy 2: Buy Kalshi NO (Bucs) + Buy Poly Panthers
-        combo2_total = prices['kalshi_no_ask'] + prices['poly_panthers']
-        combo2_gross_profit = 1.0 - combo2_total
-        
-        kalshi_cost2 = prices['kalshi_no_ask']
-        poly_cost2 = prices['poly_panthers']
-        kalshi_fee2 = kalshi_cost2 * KALSHI_TAKER_FEE
-        poly_fee2 = poly_cost2 * ON_CHAIN_COST
-        combo2_net_profit = combo2_gross_profit - kalshi_fee2 - poly_fee2
-        
-        if combo2_gross_profit >= MIN_PROFIT_THRESHOLD:
-            opportunities.append({
-                'timestamp': ts,
-                'strategy': 'Kalshi NO (Bucs) + Poly Panthers',
-                'kalshi_side': 'NO Carolina (= Bucs)',
-                'kalshi_price': prices['kalshi_no_ask'],
-                'poly_side': 'Panthers',
-                'poly_price': prices['poly_panthers'],
-                'gross_profit_pct': combo2_gross_profit * 100,
-                'net_profit_pct': combo2_net_profit * 100,
-                'kalshi_volume': prices.get('kalshi_volume', 0),
-                'poly_volume': prices.get('poly_volume', 0)
-            })
+for i in hits:
+    ts = timestamps[i]
+    kalshi_volume = kalshi_volumes[i]
+    poly_volume = poly_volumes[i]
+    
+    # Net profit after fees (conservative: assume taker on both)
+    combo1_gross_profit = combo1_gross[i]
+    if combo1_gross_profit >= MIN_PROFIT_THRESHOLD:
+        combo1_net_profit = combo1_gross_profit - kalshi_yes_asks[i] * KALSHI_TAKER_FEE - poly_bucs[i] * ON_CHAIN_COST
+        opportunities.append(Opportunity(
+            timestamp=ts,
+            timestamp_ms=timestamps_ms[i],
+            strategy='Kalshi YES (Panthers) + Poly Bucs',
+            kalshi_side='YES Panthers',
+            kalshi_price=kalshi_yes_asks[i],
+            poly_side='Buccaneers',
+            poly_price=poly_bucs[i],
+            gross_profit=combo1_gross_profit,
+            net_profit=combo1_net_profit,
+            kalshi_volume=kalshi_volume,
+            poly_volume=poly_volume
+        ))
+    
+    combo2_gross_profit = combo2_gross[i]
+    if combo2_gross_profit >= MIN_PROFIT_THRESHOLD:
+        combo2_net_profit = combo2_gross_profit - kalshi_no_asks[i] * KALSHI_TAKER_FEE - poly_panthers[i] * ON_CHAIN_COST
+        opportunities.append(Opportunity(
+            timestamp=ts,
+            timestamp_ms=timestamps_ms[i],
+            strategy='Kalshi NO (Bucs) + Poly Panthers',
+            kalshi_side='NO Carolina (= Bucs)',
+            kalshi_price=kalshi_no_asks[i],
+            poly_side='Panthers',
+            poly_price=poly_panthers[i],
+            gross_profit=combo2_gross_profit,
+            net_profit=combo2_net_profit,
+            kalshi_volume=kalshi_volume,
+            poly_volume=poly_volume
+        ))
 
 print(f"\n✅ Found {len(opportunities):,} arbitrage opportunities")
 
@@ -150,78 +200,50 @@ if not opportunities:
 
 # Analyze opportunity windows (consecutive opportunities = same window)
 print(f"\n⏱️  ANALYZING OPPORTUNITY WINDOWS...")
-print("-" * 100)
+print(HBAR100)
+
+# A new window starts on a gap of more than 10 seconds or a change of strategy
+window_starts = [0] + [
+    i for i in range(1, len(opportunities))
+    if opportunities[i].timestamp_ms - opportunities[i - 1].timestamp_ms > 10000
+    or opportunities[i].strategy != opportunities[i - 1].strategy
+]
+window_ends = window_starts[1:] + [len(opportunities)]
 
 windows = []
-current_window = None
 
-for opp in opportunities:
-    opp_time = datetime.fromisoformat(opp['timestamp'].replace('Z', ''))
+for start, end in zip(window_starts, window_ends):
+    window_opps = opportunities[start:end]
+    first = window_opps[0]
+    net_profits = [opp.net_profit for opp in window_opps]
+    start_time = datetime.fromisoformat(first.timestamp)
+    end_time = datetime.fromisoformat(window_opps[-1].timestamp)
     
-    if current_window is None:
-        # Start new window
-        current_window = {
-            'start': opp_time,
-            'end': opp_time,
-            'strategy': opp['strategy'],
-            'opportunities': [opp],
-            'min_net_profit': opp['net_profit_pct'],
-            'max_net_profit': opp['net_profit_pct'],
-            'avg_kalshi_volume': opp['kalshi_volume'],
-            'avg_poly_volume': opp['poly_volume']
-        }
-    else:
-        # Check if this is part of the same window (within 10 seconds and same strategy)
-        time_diff = (opp_time - current_window['end']).total_seconds()
-        
-        if time_diff <= 10 and opp['strategy'] == current_window['strategy']:
-            # Extend current window
-            current_window['end'] = opp_time
-            current_window['opportunities'].append(opp)
-            current_window['min_net_profit'] = min(current_window['min_net_profit'], opp['net_profit_pct'])
-            current_window['max_net_profit'] = max(current_window['max_net_profit'], opp['net_profit_pct'])
-        else:
-            # Close current window and start new one
-            current_window['duration'] = (current_window['end'] - current_window['start']).total_seconds()
-            windows.append(current_window)
-            
-            current_window = {
-                'start': opp_time,
-                'end': opp_time,
-                'strategy': opp['strategy'],
-                'opportunities': [opp],
-                'min_net_profit': opp['net_profit_pct'],
-                'max_net_profit': opp['net_profit_pct'],
-                'avg_kalshi_volume': opp['kalshi_volume'],
-                'avg_poly_volume': opp['poly_volume']
-            }
-
-# Don't forget the last window
-if current_window:
-    current_window['duration'] = (current_window['end'] - current_window['start']).total_seconds()
-    windows.append(current_window)
+    windows.append({
+        'start': start_time,
+        'end': end_time,
+        'strategy': first.strategy,
+        'opportunities': window_opps,
+        'min_net_profit': min(net_profits) * 100,
+        'max_net_profit': max(net_profits) * 100,
+        'avg_kalshi_volume': first.kalshi_volume,
+        'avg_poly_volume': first.poly_volume,
+        'duration': (end_time - start_time).total_seconds()
+    })
 
 print(f"\n📈 ARBITRAGE WINDOWS DETECTED: {len(windows)}")
-print("-" * 100)
+print(HBAR100)
 
 for i, window in enumerate(windows, 1):
-    print(f"\n🎯 Window #{i}")
-    print(f"   Strategy: {window['strategy']}")
-    print(f"   Start:    {window['start'].strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"   End:      {window['end'].strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"   Duration: {window['duration']:.1f} seconds")
-    print(f"   Snapshots: {len(window['opportunities'])}")
-    print(f"   Net Profit Range: {window['min_net_profit']:.2f}% - {window['max_net_profit']:.2f}%")
-    print(f"   Avg Kalshi Volume: ${window['avg_kalshi_volume']:,.2f}")
-    print(f"   Avg Poly Volume: ${window['avg_poly_volume']:,.2f}")
+    print(WINDOW_TEMPLATE.format(number=i, snapshots=len(window['opportunities']), **window))
 
 # Calculate tradeability
-print("\n" + "=" * 100)
+print("\n" + BAR100)
 print("💰 TRADEABILITY ANALYSIS")
-print("=" * 100)
+print(BAR100)
 
 print("\n📊 SUMMARY STATISTICS:")
-print("-" * 100)
+print(HBAR100)
 total_duration = sum(w['duration'] for w in windows)
 avg_duration = total_duration / len(windows) if windows else 0
 max_duration = max(w['duration'] for w in windows) if windows else 0
@@ -234,10 +256,10 @@ print(f"Longest window: {max_duration:.1f} seconds")
 print(f"Shortest window: {min_duration:.1f} seconds")
 
 # Find best opportunities
-best_windows = sorted(windows, key=lambda w: w['max_net_profit'], reverse=True)[:5]
+best_windows = heapq.nlargest(5, windows, key=lambda w: w['max_net_profit'])
 
 print("\n🔥 TOP 5 MOST PROFITABLE WINDOWS:")
-print("-" * 100)
+print(HBAR100)
 for i, window in enumerate(best_windows, 1):
     print(f"\n#{i} - {window['strategy']}")
     print(f"    Time: {window['start'].strftime('%H:%M:%S')} - {window['end'].strftime('%H:%M:%S')}")
@@ -246,12 +268,12 @@ for i, window in enumerate(best_windows, 1):
     print(f"    Volume: Kalshi ${window['avg_kalshi_volume']:,.0f} | Poly ${window['avg_poly_volume']:,.0f}")
 
 # Realistic execution analysis
-print("\n" + "=" * 100)
+print("\n" + BAR100)
 print("🎯 REALISTIC EXECUTION SCENARIOS")
-print("=" * 100)
+print(BAR100)
 
 print("\n⏱️  EXECUTION TIME REQUIREMENTS:")
-print("-" * 100)
+print(HBAR100)
 print("Human execution time: ~30-60 seconds (manual trading)")
 print("Bot execution time: ~2-5 seconds (automated)")
 print("")
@@ -264,7 +286,7 @@ print(f"Windows tradeable by BOT (>= 5s): {len(tradeable_windows_bot)} ({len(tra
 
 if tradeable_windows_human:
     print("\n💵 CAPITAL DEPLOYMENT SCENARIOS (Human-tradeable windows):")
-    print("-" * 100)
+    print(HBAR100)
     
     capital_tiers = [100, 500, 1000, 5000]
     
@@ -282,7 +304,7 @@ if tradeable_windows_human:
 
 conn.close()
 
-print("\n" + "=" * 100)
+print("\n" + BAR100)
 print("✅ ANALYSIS COMPLETE")
-print("=" * 100)
+print(BAR100)
 
@@ -5,16 +5,23 @@ Shows side-by-side orderbooks from Kalshi and Polymarket
 """
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from kalshi_client import KalshiClient
 from polymarket_client import PolymarketClient
 
+# Output banners
+BAR100 = "=" * 100
+HBAR100 = "-" * 100
+BAR80 = "=" * 80
+HBAR80 = "-" * 80
+
 def format_orderbook_table(title, bids, asks, max_rows=10):
     """Format orderbook as a table"""
     print(f"\n{title}")
-    print("=" * 80)
+    print(BAR80)
     print(f"{'BIDS (Buy Orders)':^40} | {'ASKS (Sell Orders)':^40}")
     print(f"{'Price':>15} {'Size':>20} | {'Price':>15} {'Size':>20}")
-    print("-" * 80)
+    print(HBAR80)
     
     max_len = max(len(bids), len(asks), max_rows)
     for i in range(min(max_len, max_rows)):
@@ -38,9 +45,9 @@ def format_orderbook_table(title, bids, asks, max_rows=10):
 with open('config/settings.json', 'r') as f:
     config = json.load(f)
 
-print("=" * 100)
+print(BAR100)
 print("🏈 ARIZONA vs LA RAMS - ORDERBOOK COMPARISON")
-print("=" * 100)
+print(BAR100)
 
 # Initialize clients
 kalshi = KalshiClient(
@@ -49,16 +56,32 @@ kalshi = KalshiClient(
 )
 polymarket = PolymarketClient()
 
-print("\n" + "=" * 100)
-print("📊 KALSHI ORDERBOOKS")
-print("=" * 100)
-
-# Get Kalshi orderbooks for both markets
 arizona_ticker = "KXNFLGAME-26JAN04ARILA-ARI"
 rams_ticker = "KXNFLGAME-26JAN04ARILA-LA"
+poly_slug = "nfl-ari-la-2026-01-04"
+
+# Fetch everything up front - Kalshi and Polymarket requests overlap instead of running back to back
+executor = ThreadPoolExecutor(max_workers=6)
+ari_raw_future = executor.submit(kalshi._make_request, 'GET', f'/markets/{arizona_ticker}/orderbook', params={'depth': 10})
+rams_raw_future = executor.submit(kalshi._make_request, 'GET', f'/markets/{rams_ticker}/orderbook', params={'depth': 10})
+ari_market_future = executor.submit(kalshi.get_market, arizona_ticker)
+rams_market_future = executor.submit(kalshi.get_market, rams_ticker)
+
+# Polymarket orderbooks need the token IDs first
+token_data = executor.submit(polymarket.get_token_ids_from_slug, poly_slug).result()
+poly_books_future = None
+if token_data and token_data['tokens']:
+    poly_books_future = executor.submit(
+        polymarket.get_orderbooks, [token['token_id'] for token in token_data['tokens']]
+    )
+
+print("\n" + BAR100)
+print("📊 KALSHI ORDERBOOKS")
+print(BAR100)
 
-ari_raw = kalshi._make_request('GET', f'/markets/{arizona_ticker}/orderbook', params={'depth': 10})
-rams_raw = kalshi._make_request('GET', f'/markets/{rams_ticker}/orderbook', params={'depth': 10})
+# Get Kalshi orderbooks for both markets
+ari_raw = ari_raw_future.result()
+rams_raw = rams_raw_future.result()
 
 if ari_raw and rams_raw:
     ari_ob = ari_raw['orderbook']
@@ -100,15 +123,13 @@ if ari_raw and rams_raw:
     
     format_orderbook_table("LA Rams NO Orderbook (Kalshi)", rams_no_bids[:10], rams_no_asks[:10])
 
-print("\n\n" + "=" * 100)
+print("\n\n" + BAR100)
 print("📊 POLYMARKET ORDERBOOKS")
-print("=" * 100)
-
-# Get Polymarket orderbook
-poly_slug = "nfl-ari-la-2026-01-04"
-token_data = polymarket.get_token_ids_from_slug(poly_slug)
+print(BAR100)
 
 if token_data and token_data['tokens']:
+    poly_books = poly_books_future.result()
+    
     for token in token_data['tokens']:
         team_name = token['outcome']
         token_id = token['token_id']
@@ -118,7 +139,7 @@ if token_data and token_data['tokens']:
         print(f"Current Price: ${current_price:.2f}")
         
         # Get orderbook
-        orderbook = polymarket.get_orderbook(token_id)
+        orderbook = poly_books.get(token_id)
         
         if orderbook:
             bids = orderbook['bids']
@@ -128,9 +149,10 @@ if token_data and token_data['tokens']:
             
             # VWAP analysis
             print(f"\n💰 Trade Cost Analysis (buying {team_name} YES):")
-            print("-" * 80)
-            for size in [100, 500, 1000, 2000, 5000]:
-                vwap, filled, remaining, slippage = polymarket.calculate_vwap(asks, size)
+            print(HBAR80)
+            trade_sizes = [100, 500, 1000, 2000, 5000]
+            vwap_results = polymarket.calculate_vwap_vector(asks, trade_sizes)
+            for size, (vwap, filled, remaining, slippage) in zip(trade_sizes, vwap_results):
                 if vwap and filled == size:
                     print(f"  {size:>5,} contracts: ${vwap:.4f} VWAP | Slippage: {slippage:>5.2f}% | Cost: ${vwap * size:>10,.2f}")
                 elif vwap:
@@ -139,19 +161,19 @@ if token_data and token_data['tokens']:
                     print(f"  {size:>5,} contracts: ❌ Insufficient liquidity")
 
 # Summary
-print("\n\n" + "=" * 100)
+print("\n\n" + BAR100)
 print("📊 SUMMARY")
-print("=" * 100)
+print(BAR100)
 
 # Get current top-of-book prices
-ari_market = kalshi.get_market(arizona_ticker)
-rams_market = kalshi.get_market(rams_ticker)
+ari_market = ari_market_future.result()
+rams_market = rams_market_future.result()
 
 print("\n🏈 Current Market Prices:")
-print("-" * 100)
+print(HBAR100)
 print(f"{'Platform':<15} {'Arizona':^30} {'LA Rams':^30}")
 print(f"{'':15} {'Bid':>12} {'Ask':>12} {'Spread':>6} {'Bid':>12} {'Ask':>12} {'Spread':>6}")
-print("-" * 100)
+print(HBAR100)
 
 kalshi_ari_spread = f"{((ari_market['yes_ask'] - ari_market['yes_bid']) / ari_market['yes_bid'] * 100):.1f}%"
 kalshi_rams_spread = f"{((rams_market['yes_ask'] - rams_market['yes_bid']) / rams_market['yes_bid'] * 100):.1f}%"
@@ -163,8 +185,9 @@ if token_data and len(token_data['tokens']) == 2:
     ari_token = [t for t in token_data['tokens'] if 'Cardinals' in t['outcome']][0]
     rams_token = [t for t in token_data['tokens'] if 'Rams' in t['outcome']][0]
     
-    ari_ob = polymarket.get_orderbook(ari_token['token_id'])
-    rams_ob = polymarket.get_orderbook(rams_token['token_id'])
+    # Same books as printed above - no second /books round trip
+    ari_ob = poly_books.get(ari_token['token_id'])
+    rams_ob = poly_books.get(rams_token['token_id'])
     
     if ari_ob and rams_ob and ari_ob['bids'] and ari_ob['asks'] and rams_ob['bids'] and rams_ob['asks']:
         poly_ari_bid = ari_ob['bids'][0][0]
@@ -182,10 +205,11 @@ print("\n💡 Note: Kalshi uses two markets per game (one for each team)")
 print("   Polymarket uses one market with two outcomes")
 
 # Cleanup
+executor.shutdown()
 kalshi.close()
 polymarket.close()
 
-print("\n" + "=" * 100)
+print("\n" + BAR100)
 print("✅ Complete!")
-print("=" * 100)
+print(BAR100)
 